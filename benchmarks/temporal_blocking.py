@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+"""Compare stepping one sweep per time step with temporal blocking.
+
+Only wall time is measured. Temporal blocking is meant to reduce traffic
+to main memory, but this benchmark does not read hardware counters, so
+that reduction shows up only indirectly, as a speedup on grids too large
+for cache. To measure traffic itself, run it under a profiler that reads
+memory-controller counters (for example ``perf stat`` or likwid).
+
+Example::
+
+    $ python benchmarks/temporal_blocking.py --shape 4096 4096 --steps 32
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from heat import Heat
+
+
+def _block_steps(value: str) -> int:
+    block_steps = int(value)
+    if block_steps <= 1:
+        raise argparse.ArgumentTypeError(f"{value}: must be greater than 1")
+    return block_steps
+
+
+def time_steps(
+    shape: tuple[int, int],
+    n_steps: int,
+    block_steps: int,
+    tile_rows: int | None,
+    backend: str,
+) -> float:
+    """Wall time, in seconds, to advance a model *n_steps*."""
+    heat = Heat(
+        shape=shape, backend=backend, block_steps=block_steps, tile_rows=tile_rows
+    )
+    heat.advance_in_time(min(n_steps, 2))
+
+    start = time.perf_counter()
+    heat.advance_in_time(n_steps)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shape", type=int, nargs=2, default=(4096, 4096))
+    parser.add_argument("--steps", type=int, default=32)
+    parser.add_argument("--block-steps", type=_block_steps, default=8)
+    parser.add_argument("--tile-rows", type=int, default=None)
+    parser.add_argument("--backend", default="numpy")
+    args = parser.parse_args()
+
+    shape = (args.shape[0], args.shape[1])
+    n_cells = shape[0] * shape[1]
+
+    stepped = time_steps(shape, args.steps, 1, args.tile_rows, args.backend)
+    blocked = time_steps(
+        shape, args.steps, args.block_steps, args.tile_rows, args.backend
+    )
+
+    for block_steps, elapsed in ((1, stepped), (args.block_steps, blocked)):
+        print(
+            f"block_steps={block_steps:3d}: {elapsed:8.3f} s,"
+            f" {args.steps * n_cells / elapsed:.3e} cell updates/s"
+        )
+    print(f"measured speedup: {stepped / blocked:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
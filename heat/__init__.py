@@ -4,5 +4,6 @@ from ._version import __version__
 from .bmi_heat import BmiHeat
 from .heat import Heat
 from .heat import solve_2d
+from .pool import BmiHeatPool
 
-__all__ = ["__version__", "BmiHeat", "solve_2d", "Heat"]
+__all__ = ["__version__", "BmiHeat", "BmiHeatPool", "solve_2d", "Heat"]
@@ -1,21 +1,36 @@
 #! /usr/bin/env python
 """Basic Model Interface implementation for the 2D heat model."""
 
+import copy
+from io import TextIOBase
 from typing import Any
 
 import numpy as np
+import yaml
 from bmipy import Bmi
 from numpy.typing import NDArray
 
 from .heat import Heat
+from .heat import load_config
+from .history import FieldHistory
+from .probes import ProbeRecorder
+from .pyramid import Pyramid
+from .snapshots import SnapshotRing
+from .stats import RunningStatistics
+from .tiles import ChangeTracker
+from .tiles import TileLayout
 
 
 class BmiHeat(Bmi):
     """Solve the heat equation for a 2D plate."""
 
     _name = "The 2D Heat Equation"
-    _input_var_names = ("plate_surface__temperature",)
-    _output_var_names = ("plate_surface__temperature",)
+    _input_var_names: tuple[str, ...] = (
+        "plate_surface__temperature",
+        "plate_surface__heat_source_rate",
+        "plate_surface__thermal_diffusivity",
+    )
+    _output_var_names: tuple[str, ...] = ("plate_surface__temperature",)
 
     def __init__(self) -> None:
         """Create a BmiHeat model that is ready for initialization."""
@@ -26,36 +41,213 @@ class BmiHeat(Bmi):
         self._var_loc: dict[str, str] = {}
         self._grids: dict[int, list[str]] = {}
         self._grid_type: dict[int, str] = {}
+        self._grid_shape: dict[int, tuple[int, int]] = {}
+        self._grid_spacing: dict[int, tuple[float, float]] = {}
+        self._grid_origin: dict[int, tuple[float, float]] = {}
+        self._coarsened: dict[str, int] = {}
+        self._pyramid: Pyramid | None = None
+        self._statistics: RunningStatistics | None = None
+        self._history: FieldHistory | None = None
+        self._tile_consumers: dict[str, tuple[str, ChangeTracker]] = {}
+        self._snapshots: SnapshotRing | None = None
+        self._max_snapshots = 8
 
         self._start_time = 0.0
         self._end_time = float(np.finfo("d").max)
         self._time_units = "s"
 
-    def initialize(self, filename: str | None = None) -> None:
+    def initialize(self, filename: str | TextIOBase | None = None) -> None:
         """Initialize the Heat model.
 
         Parameters
         ----------
-        filename : str, optional
-            Path to name of input file.
+        filename : str or file_like, optional
+            Path to name of input file, or an open input file.
+
+        Notes
+        -----
+        In addition to the parameters of :class:`~heat.Heat`, the input
+        file may set *statistics* to ``true`` to keep running per-cell
+        statistics of the temperature, updated every time step, as extra
+        output variables. A list of *coarsening_factors* adds, for each
+        factor, the block-averaged temperature as an output variable on
+        its own, coarser, uniform rectilinear grid. These are computed only
+        when their values are requested, and then cached until the
+        temperature next changes through :meth:`update` or a setter.
+        *max_snapshots* sets how many snapshots :meth:`save_state` keeps.
+        Setting *history* to ``true``, or to a mapping of parameters for
+        :class:`~heat.history.FieldHistory`, keeps a compressed copy of
+        the temperature at every time step (see :meth:`get_history`).
+        The diffusivity, *alpha*, may be the path to a ``.npy`` file of
+        per-cell values, which can also be set through the
+        *plate_surface__thermal_diffusivity* input variable.
         """
+        self._initialize_from_config(self._read_config(filename))
+
+    def _initialize_from_config(self, config: dict[str, Any]) -> None:
+        """Initialize the model from parsed input parameters."""
+        self._config = copy.deepcopy(config)
+
+        statistics = config.pop("statistics", False)
+        coarsening_factors = config.pop("coarsening_factors", ())
+        self._max_snapshots = config.pop("max_snapshots", 8)
+        history = config.pop("history", False)
+
+        self._model = Heat(**config)
+
+        self._values = {"plate_surface__temperature": self._model.temperature}
+        self._var_units = {
+            "plate_surface__temperature": "K",
+            "plate_surface__heat_source_rate": "K s-1",
+            "plate_surface__thermal_diffusivity": "m2 s-1",
+        }
+        self._var_loc = {
+            "plate_surface__temperature": "node",
+            "plate_surface__heat_source_rate": "node",
+            "plate_surface__thermal_diffusivity": "node",
+        }
+        self._grids = {
+            0: [
+                "plate_surface__temperature",
+                "plate_surface__heat_source_rate",
+                "plate_surface__thermal_diffusivity",
+            ]
+        }
+        self._grid_type = {0: "uniform_rectilinear"}
+        self._grid_shape = {0: self._model.shape}
+        self._grid_spacing = {0: self._model.spacing}
+        self._grid_origin = {0: self._model.origin}
+        self._output_var_names = BmiHeat._output_var_names
+
+        if statistics:
+            self._statistics = RunningStatistics(self._model.temperature)
+            self._add_output_vars(
+                {
+                    "plate_surface__time_average_of_temperature": (
+                        self._statistics.mean,
+                        "K",
+                    ),
+                    "plate_surface__time_min_of_temperature": (
+                        self._statistics.minimum,
+                        "K",
+                    ),
+                    "plate_surface__time_max_of_temperature": (
+                        self._statistics.maximum,
+                        "K",
+                    ),
+                    "plate_surface__time_variance_of_temperature": (
+                        self._statistics.variance,
+                        "K2",
+                    ),
+                },
+                grid=0,
+            )
+        else:
+            self._statistics = None
+
+        if history:
+            self._history = FieldHistory(
+                self._model.shape, **(history if isinstance(history, dict) else {})
+            )
+            self._history.append(self._model.time, self._model.temperature)
+        else:
+            self._history = None
+
+        self._tile_consumers = {}
+        self._snapshots = None
+        self._coarsened = {}
+        if coarsening_factors:
+            self._pyramid = Pyramid(self._model.temperature, coarsening_factors)
+            for grid, factor in enumerate(self._pyramid.factors, start=1):
+                suffix = f"{factor}x{factor}"
+                name = f"plate_surface__block_average_of_temperature_{suffix}"
+                level = self._pyramid.buffer(factor)
+                self._coarsened[name] = factor
+                self._add_output_vars({name: (level, "K")}, grid=grid)
+                self._grid_type[grid] = "uniform_rectilinear"
+                self._grid_shape[grid] = level.shape
+                self._grid_spacing[grid] = (
+                    self._model.spacing[0] * factor,
+                    self._model.spacing[1] * factor,
+                )
+                self._grid_origin[grid] = (
+                    self._model.origin[0] + 0.5 * (factor - 1) * self._model.spacing[0],
+                    self._model.origin[1] + 0.5 * (factor - 1) * self._model.spacing[1],
+                )
+        else:
+            self._pyramid = None
+
+    @staticmethod
+    def _read_config(filename: str | TextIOBase | None) -> dict[str, Any]:
+        """Read an input file, a file-like object, or nothing."""
         if filename is None:
-            self._model = Heat()
+            return {}
         elif isinstance(filename, str):
-            with open(filename) as file_obj:
-                self._model = Heat.from_file_like(file_obj)
+            return load_config(filename)
         else:
-            self._model = Heat.from_file_like(filename)
+            return yaml.safe_load(filename) or {}
 
-        self._values = {"plate_surface__temperature": self._model.temperature}
-        self._var_units = {"plate_surface__temperature": "K"}
-        self._var_loc = {"plate_surface__temperature": "node"}
-        self._grids = {0: ["plate_surface__temperature"]}
-        self._grid_type = {0: "uniform_rectilinear"}
+    def reset(self, filename: str | None = None) -> None:
+        """Return an initialized model to its initial state.
+
+        If the configuration is unchanged, the model's arrays are reused
+        rather than reallocated and references obtained through
+        :meth:`get_value_ptr` remain valid. Otherwise, this is the same as
+        :meth:`initialize`. Either way, probes, tile consumers and saved
+        snapshots are removed.
+
+        Parameters
+        ----------
+        filename : str, optional
+            Path to name of input file.
+        """
+        config = self._read_config(filename)
+        if not hasattr(self, "_model") or config != self._config:
+            self._initialize_from_config(config)
+            return
+
+        self._model.reset()
+        if self._statistics is not None:
+            self._statistics.reset(self._model.temperature)
+        if self._history is not None:
+            self._history.clear()
+            self._history.append(self._model.time, self._model.temperature)
+        self._tile_consumers = {}
+        if self._snapshots is not None:
+            self._snapshots.clear()
+        self._temperature_changed()
+
+    def _add_output_vars(
+        self, variables: dict[str, tuple[NDArray[Any], str]], grid: int
+    ) -> None:
+        """Add node-centered output variables to a grid."""
+        for name, (values, units) in variables.items():
+            self._values[name] = values
+            self._var_units[name] = units
+            self._var_loc[name] = "node"
+            self._grids.setdefault(grid, []).append(name)
+        self._output_var_names += tuple(variables)
 
     def update(self) -> None:
         """Advance model by one time step."""
         self._model.advance_in_time()
+        if self._statistics is not None:
+            self._statistics.add(self._model.temperature)
+        if self._history is not None:
+            self._history.append(self._model.time, self._model.temperature)
+        self._temperature_changed()
+
+    def _value_changed(self, var_name: str) -> None:
+        """Update the model after the values of a variable are set."""
+        if var_name == "plate_surface__temperature":
+            self._temperature_changed()
+        elif var_name == "plate_surface__thermal_diffusivity":
+            self._model.diffusivity_changed()
+
+    def _temperature_changed(self) -> None:
+        """Discard values derived from the temperature."""
+        if self._pyramid is not None:
+            self._pyramid.invalidate()
 
     def update_frac(self, time_frac: float) -> None:
         """Update model by a fraction of a time step.
@@ -80,9 +272,14 @@ class BmiHeat(Bmi):
         """
         n_steps = (then - self.get_current_time()) / self.get_time_step()
 
-        for _ in range(int(n_steps)):
-            self.update()
-        self.update_frac(n_steps - int(n_steps))
+        if self._statistics is None and self._history is None:
+            self._model.advance_in_time(int(n_steps))
+            self._temperature_changed()
+        else:
+            for _ in range(int(n_steps)):
+                self.update()
+        if n_steps > int(n_steps):
+            self.update_frac(n_steps - int(n_steps))
 
     def finalize(self) -> None:
         """Finalize model."""
@@ -102,7 +299,7 @@ class BmiHeat(Bmi):
         str
             Data type.
         """
-        return str(self.get_value_ptr(var_name).dtype)
+        return str(self._var_array(var_name).dtype)
 
     def get_var_units(self, var_name: str) -> str:
         """Get units of variable.
@@ -132,7 +329,7 @@ class BmiHeat(Bmi):
         int
             Size of data array in bytes.
         """
-        return self.get_value_ptr(var_name).nbytes
+        return self._var_array(var_name).nbytes
 
     def get_var_itemsize(self, name: str) -> int:
         return np.dtype(self.get_var_type(name)).itemsize
@@ -171,7 +368,7 @@ class BmiHeat(Bmi):
         int
             Rank of grid.
         """
-        return len(self._model.shape)
+        return len(self._grid_shape[grid_id])
 
     def get_grid_size(self, grid_id: int) -> int:
         """Size of grid.
@@ -186,11 +383,27 @@ class BmiHeat(Bmi):
         int
             Size of grid.
         """
-        return int(np.prod(self._model.shape))
+        return int(np.prod(self._grid_shape[grid_id]))
+
+    def _var_array(self, var_name: str) -> NDArray[Any]:
+        """Array with the type and shape of a variable, not brought up to date."""
+        if var_name in (
+            "plate_surface__heat_source_rate",
+            "plate_surface__thermal_diffusivity",
+        ):
+            # Same type and shape as the temperature, but allocated on first use.
+            return self._model.temperature
+        if var_name in self._coarsened and self._pyramid is not None:
+            return self._pyramid.buffer(self._coarsened[var_name])
+        return self.get_value_ptr(var_name)
 
     def get_value_ptr(self, var_name: str) -> NDArray[Any]:
         """Reference to values.
 
+        Coarsened variables are computed when requested, so the array
+        returned for one of these is a snapshot that is brought up to date
+        only by calling :meth:`get_value_ptr` again after each update.
+
         Parameters
         ----------
         var_name : str
@@ -201,6 +414,12 @@ class BmiHeat(Bmi):
         array_like
             Value array.
         """
+        if var_name == "plate_surface__heat_source_rate":
+            return self._model.source
+        if var_name == "plate_surface__thermal_diffusivity":
+            return self._model.diffusivity
+        if var_name in self._coarsened and self._pyramid is not None:
+            return self._pyramid.level(self._coarsened[var_name])
         return self._values[var_name]
 
     def get_value(self, var_name: str, dest: NDArray[Any]) -> NDArray[Any]:
@@ -255,6 +474,7 @@ class BmiHeat(Bmi):
         """
         val = self.get_value_ptr(var_name)
         val[:] = src.reshape(val.shape)
+        self._value_changed(var_name)
 
     def set_value_at_indices(
         self, name: str, inds: NDArray[np.int_], src: NDArray[Any]
@@ -272,6 +492,297 @@ class BmiHeat(Bmi):
         """
         val = self.get_value_ptr(name)
         val.flat[inds] = src
+        self._value_changed(name)
+
+    def _window(
+        self, var_name: str, rows: tuple[int, int], cols: tuple[int, int]
+    ) -> NDArray[Any]:
+        """View of a rectangular window of a variable."""
+        val = self.get_value_ptr(var_name)
+        for (start, stop), size in zip((rows, cols), val.shape):
+            if not 0 <= start < stop <= size:
+                raise ValueError(
+                    f"({start}, {stop}): window extends outside of grid (0, {size})"
+                )
+        return val[slice(*rows), slice(*cols)]
+
+    def get_value_window(
+        self,
+        var_name: str,
+        dest: NDArray[Any],
+        rows: tuple[int, int],
+        cols: tuple[int, int],
+    ) -> NDArray[Any]:
+        """Copy of values within a rectangular window of the grid.
+
+        Parameters
+        ----------
+        var_name : str
+            Name of variable as CSDMS Standard Name.
+        dest : ndarray
+            A numpy array into which to place the values. This is either
+            the shape of the window or, if it can be reshaped to the shape
+            of the window without a copy, any array of that size.
+        rows : tuple of int
+            Start and stop rows of the window.
+        cols : tuple of int
+            Start and stop columns of the window.
+
+        Returns
+        -------
+        array_like
+            Copy of values.
+        """
+        window = self._window(var_name, rows, cols)
+        if dest.shape == window.shape:
+            np.copyto(dest, window)
+            return dest
+
+        view = dest.reshape(window.shape)
+        if not np.shares_memory(view, dest):
+            raise ValueError(
+                f"{dest.shape}: destination cannot be viewed as the window's"
+                f" shape, {window.shape}, without a copy"
+            )
+        np.copyto(view, window)
+        return dest
+
+    def set_value_window(
+        self,
+        var_name: str,
+        src: NDArray[Any],
+        rows: tuple[int, int],
+        cols: tuple[int, int],
+    ) -> None:
+        """Set model values within a rectangular window of the grid.
+
+        Parameters
+        ----------
+        var_name : str
+            Name of variable as CSDMS Standard Name.
+        src : array_like
+            Array of new values, in row-major order.
+        rows : tuple of int
+            Start and stop rows of the window.
+        cols : tuple of int
+            Start and stop columns of the window.
+        """
+        window = self._window(var_name, rows, cols)
+        np.copyto(window, np.asarray(src).reshape(window.shape))
+        self._value_changed(var_name)
+
+    def set_point_sources(
+        self, inds: NDArray[np.int_], rates: float | NDArray[np.float64]
+    ) -> None:
+        """Set heat sources and sinks at a few cells.
+
+        Point sources are a sparse alternative to setting
+        *plate_surface__heat_source_rate*, to which they are added.
+
+        Parameters
+        ----------
+        inds : array_like
+            Flat indices of the cells.
+        rates : array_like
+            Rate of change of temperature at each cell.
+        """
+        self._model.set_point_sources(inds, rates)
+
+    def save_state(self, name: str) -> None:
+        """Save a named snapshot of the model state.
+
+        The temperature, time and time step are copied into one of a fixed
+        number of buffers, allocated on the first save. Once all are in
+        use, the least recently saved or restored snapshot is replaced.
+
+        Parameters
+        ----------
+        name : str
+            Name of the snapshot.
+        """
+        if self._snapshots is None:
+            self._snapshots = SnapshotRing(
+                self._model.shape,
+                self._max_snapshots,
+                dtype=self._model.temperature.dtype,
+            )
+        self._snapshots.save(
+            name,
+            self._model.temperature,
+            time=self._model.time,
+            time_step=self._model.time_step,
+        )
+
+    def restore_state(self, name: str) -> None:
+        """Return the model to a saved snapshot.
+
+        The temperature is copied into the existing array, so references
+        from :meth:`get_value_ptr` remain valid. Snapshots do not include
+        running statistics, which instead start again from the restored
+        temperature, so that they never include the discarded time steps.
+        Likewise, the history loses the snapshots taken after the restored
+        time.
+
+        Parameters
+        ----------
+        name : str
+            Name of the snapshot.
+        """
+        if self._snapshots is None:
+            raise KeyError(f"{name!r}: no snapshot with this name")
+        time, time_step = self._snapshots.restore(name, self._model.temperature)
+        self._model.time = time
+        self._model.time_step = time_step
+        if self._statistics is not None:
+            self._statistics.reset(self._model.temperature)
+        if self._history is not None:
+            self._history.truncate(time)
+            if len(self._history) == 0 or self._history.times[-1] < time:
+                self._history.append(time, self._model.temperature)
+        self._temperature_changed()
+
+    def get_history(self) -> FieldHistory:
+        """Compressed history of the temperature.
+
+        Returns
+        -------
+        FieldHistory
+            Snapshots of the temperature at the start and after every
+            time step, which can be read back with
+            :meth:`~heat.history.FieldHistory.get` or
+            :meth:`~heat.history.FieldHistory.get_at_time`.
+        """
+        if self._history is None:
+            raise RuntimeError("history is not enabled in the input file")
+        return self._history
+
+    def add_probes(self, inds: NDArray[np.int_], capacity: int) -> ProbeRecorder:
+        """Record the temperature at a set of cells after every time step.
+
+        Parameters
+        ----------
+        inds : array_like
+            Flat indices of the cells.
+        capacity : int
+            Number of time steps to keep.
+
+        Returns
+        -------
+        ProbeRecorder
+            The recorder, whose *times* and *values* are views of the
+            recorded history.
+        """
+        return self._model.add_probes(inds, capacity)
+
+    def add_tile_consumer(
+        self,
+        consumer: str,
+        var_name: str = "plate_surface__temperature",
+        tile_shape: tuple[int, int] = (32, 32),
+        threshold: float = 0.0,
+    ) -> None:
+        """Start tracking changes to a variable on behalf of a consumer.
+
+        Parameters
+        ----------
+        consumer : str
+            Name that identifies the consumer.
+        var_name : str, optional
+            Name of variable as CSDMS Standard Name.
+        tile_shape : tuple of int, optional
+            Number of rows and columns in a tile.
+        threshold : float, optional
+            Tiles whose values change by no more than this since the
+            consumer last read them are not reported as changed.
+        """
+        shape = self._var_array(var_name).shape
+        self._tile_consumers[consumer] = (
+            var_name,
+            ChangeTracker(shape, tile_shape, threshold=threshold),
+        )
+
+    def get_changed_tiles(
+        self, consumer: str, dest: NDArray[Any]
+    ) -> tuple[NDArray[np.int_], NDArray[Any]]:
+        """Copy of the tiles that changed since a consumer last read them.
+
+        The first call returns every tile.
+
+        Parameters
+        ----------
+        consumer : str
+            Name that identifies the consumer.
+        dest : ndarray
+            A flat numpy array, the size of the variable, into which to
+            pack the values of the changed tiles.
+
+        Returns
+        -------
+        tuple of ndarray
+            Ids of the changed tiles (in row-major order), and a view of
+            *dest* that holds their values, tile after tile.
+        """
+        var_name, tracker = self._tile_consumers[consumer]
+        return tracker.read(self.get_value_ptr(var_name), dest)
+
+    def set_value_tiles(
+        self,
+        var_name: str,
+        tiles: NDArray[np.int_],
+        src: NDArray[Any],
+        tile_shape: tuple[int, int] = (32, 32),
+    ) -> None:
+        """Set model values tile by tile.
+
+        Parameters
+        ----------
+        var_name : str
+            Name of variable as CSDMS Standard Name.
+        tiles : array_like
+            Ids of the tiles.
+        src : array_like
+            Values of the tiles, packed as by :meth:`get_changed_tiles`.
+        tile_shape : tuple of int, optional
+            Number of rows and columns in a tile.
+        """
+        val = self.get_value_ptr(var_name)
+        TileLayout(val.shape, tile_shape).unpack(src, tiles, val)
+        self._value_changed(var_name)
+
+    def get_stencil_backend(self) -> str:
+        """Name of the stencil backend used to solve the heat equation.
+
+        Returns
+        -------
+        str
+            Name of the backend (see :mod:`heat.stencil`).
+        """
+        return self._model.backend
+
+    def get_model_nbytes(self) -> int:
+        """Number of bytes held by the model and its BMI.
+
+        This includes the model state, and the arrays kept for statistics,
+        coarsened variables and change tracking, but not temporary arrays
+        allocated while the model is updated.
+
+        Returns
+        -------
+        int
+            Size of the model's arrays in bytes.
+        """
+        nbytes = self._model.nbytes
+        if self._statistics is not None:
+            nbytes += self._statistics.nbytes
+        if self._history is not None:
+            nbytes += self._history.nbytes
+        if self._pyramid is not None:
+            nbytes += self._pyramid.nbytes
+        for _, tracker in self._tile_consumers.values():
+            nbytes += tracker.nbytes
+        if self._snapshots is not None:
+            nbytes += self._snapshots.nbytes
+        return nbytes
 
     def get_component_name(self) -> str:
         """Name of the component."""
@@ -295,22 +806,21 @@ class BmiHeat(Bmi):
 
     def get_grid_shape(self, grid_id: int, shape: NDArray[np.int_]) -> NDArray[np.int_]:
         """Number of rows and columns of uniform rectilinear grid."""
-        var_name = self._grids[grid_id][0]
-        shape[:] = self.get_value_ptr(var_name).shape
+        shape[:] = self._grid_shape[grid_id]
         return shape
 
     def get_grid_spacing(
         self, grid_id: int, spacing: NDArray[np.float64]
     ) -> NDArray[np.float64]:
         """Spacing of rows and columns of uniform rectilinear grid."""
-        spacing[:] = self._model.spacing
+        spacing[:] = self._grid_spacing[grid_id]
         return spacing
 
     def get_grid_origin(
         self, grid_id: int, origin: NDArray[np.float64]
     ) -> NDArray[np.float64]:
         """Origin of uniform rectilinear grid."""
-        origin[:] = self._model.origin
+        origin[:] = self._grid_origin[grid_id]
         return origin
 
     def get_grid_type(self, grid_id: int) -> str:
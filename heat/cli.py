@@ -0,0 +1,169 @@
+"""Run the heat model from the command line."""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from collections.abc import Sequence
+from io import StringIO
+from typing import Any
+
+import numpy as np
+import yaml
+
+from ._version import __version__
+from .bmi_heat import BmiHeat
+from .heat import load_config
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of this process, in bytes, if known."""
+    if resource is None:  # pragma: no cover
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(max_rss if sys.platform == "darwin" else max_rss * 1024)
+
+
+def run(
+    filename: str,
+    end_time: float,
+    output_interval: float | None = None,
+    output_dir: str | None = None,
+) -> dict[str, Any]:
+    """Run the heat model and measure its throughput.
+
+    Unless the input file names a stencil *backend*, the fastest one is
+    chosen for the grid.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the input file.
+    end_time : float
+        Time to run the model until.
+    output_interval : float, optional
+        Interval at which to copy out the temperature, as a coupler would.
+    output_dir : str, optional
+        Folder into which to save each copy of the temperature as a
+        ``.npy`` file.
+
+    Returns
+    -------
+    dict
+        Run statistics.
+    """
+    config = load_config(filename)
+    config.setdefault("backend", "auto")
+
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump(config)))
+
+    if output_interval is None:
+        output_times = [end_time]
+    else:
+        n_outputs = math.ceil((end_time - model.get_current_time()) / output_interval)
+        output_times = [
+            min(model.get_current_time() + n * output_interval, end_time)
+            for n in range(1, n_outputs + 1)
+        ]
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    n_cells = model.get_grid_size(0)
+    dest = np.empty(n_cells)
+    n_steps = 0
+
+    start = time.perf_counter()
+    for n, then in enumerate(output_times):
+        before = model.get_current_time()
+        model.update_until(then)
+        steps = (model.get_current_time() - before) / model.get_time_step()
+        n_steps += math.ceil(round(steps, 6))
+
+        if output_interval is not None:
+            model.get_value("plate_surface__temperature", dest)
+            if output_dir is not None:
+                np.save(os.path.join(output_dir, f"temperature-{n:06d}.npy"), dest)
+    wall_time = time.perf_counter() - start
+
+    stats = {
+        "config": os.path.abspath(filename),
+        "shape": [int(n) for n in model.get_grid_shape(0, np.empty(2, dtype=int))],
+        "backend": model.get_stencil_backend(),
+        "end_time": model.get_current_time(),
+        "n_steps": n_steps,
+        "n_outputs": len(output_times) if output_interval is not None else 0,
+        "wall_time": wall_time,
+        "steps_per_second": n_steps / wall_time if wall_time > 0 else math.inf,
+        "cell_updates_per_second": (
+            n_steps * n_cells / wall_time if wall_time > 0 else math.inf
+        ),
+        "model_nbytes": model.get_model_nbytes(),
+        "peak_rss": peak_rss(),
+    }
+    model.finalize()
+
+    return stats
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the heat model from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="heat-run",
+        description="Run the 2D heat model and report its throughput.",
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    parser.add_argument("config", help="YAML input file")
+    parser.add_argument(
+        "--end-time", type=float, required=True, help="time to run the model until"
+    )
+    parser.add_argument(
+        "--output-interval",
+        type=float,
+        default=None,
+        help="interval at which to copy out the temperature",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="folder in which to save the temperature at each output",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print run statistics as JSON"
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.output_interval is not None and args.output_interval <= 0.0:
+        parser.error("--output-interval must be positive")
+    if args.output_dir is not None and args.output_interval is None:
+        parser.error("--output-dir requires --output-interval")
+
+    stats = run(
+        args.config,
+        args.end_time,
+        output_interval=args.output_interval,
+        output_dir=args.output_dir,
+    )
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        for key, value in stats.items():
+            print(
+                f"{key}: {value:.6g}" if isinstance(value, float) else f"{key}: {value}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
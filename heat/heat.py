@@ -1,20 +1,108 @@
 """The 2D heat model."""
 from __future__ import annotations
 
+import copy
+import os
 from io import TextIOBase
+from typing import Any
 
 import numpy as np
 import yaml
 from numpy.typing import NDArray
-from scipy import ndimage
+
+from .probes import ProbeRecorder
+from .stencil import Conductances
+from .stencil import advance_blocked
+from .stencil import default_tile_rows
+from .stencil import get_backend
+from .stencil import inplace_kernel
+from .stencil import inplace_variable_kernel
+from .stencil import select_backend
+from .stencil import variable_kernel
+
+_CONFIG_CACHE: dict[str, tuple[int, dict[str, Any]]] = {}
+
+
+def load_config(filename: str) -> dict[str, Any]:
+    """Read the parameters of a heat model from a YAML file.
+
+    Parsed files are cached by path and modification time, so loading
+    the same, unchanged, file again does not parse it again. If *alpha*
+    is the path to a ``.npy`` file, a relative path is taken to be
+    relative to the folder of the input file.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the input file.
+
+    Returns
+    -------
+    dict
+        A (new) dictionary of parameters.
+    """
+    path = os.path.abspath(filename)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _CONFIG_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as file_obj:
+            cached = (mtime, yaml.safe_load(file_obj) or {})
+        if isinstance(cached[1].get("alpha"), str):
+            cached[1]["alpha"] = os.path.join(os.path.dirname(path), cached[1]["alpha"])
+        _CONFIG_CACHE[path] = cached
+
+    return copy.deepcopy(cached[1])
+
+
+def _build_stencil(
+    spacing: tuple[float, ...], alpha: float, time_step: float
+) -> NDArray[np.float64]:
+    dy2, dx2 = spacing[0] ** 2, spacing[1] ** 2
+    return (
+        np.array([[0.0, dy2, 0.0], [dx2, -2.0 * (dx2 + dy2), dx2], [0.0, dy2, 0.0]])
+        * alpha
+        * time_step
+        / (2.0 * (dx2 * dy2))
+    )
+
+
+def _harmonic_mean(
+    a: NDArray[np.float64], b: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    total = a + b
+    return np.divide(2.0 * a * b, total, out=np.zeros_like(total), where=total > 0.0)
+
+
+def _build_conductances(
+    spacing: tuple[float, ...], diffusivity: NDArray[np.float64]
+) -> Conductances:
+    """Face conductances, per unit time, for a per-cell diffusivity.
+
+    The diffusivity of a face is the harmonic mean of that of the cells
+    on either side, so that a uniform diffusivity gives the same
+    weights as :func:`_build_stencil`.
+    """
+    unit = _build_stencil(spacing, 1.0, 1.0)
+    row_faces = _harmonic_mean(diffusivity[:-1, 1:-1], diffusivity[1:, 1:-1])
+    row_faces *= unit[0, 1]
+    col_faces = _harmonic_mean(diffusivity[1:-1, :-1], diffusivity[1:-1, 1:])
+    col_faces *= unit[1, 0]
+    total = row_faces[:-1] + row_faces[1:]
+    total += col_faces[:, :-1]
+    total += col_faces[:, 1:]
+    return row_faces, col_faces, total
 
 
 def solve_2d(
     temp: NDArray[np.float64],
     spacing: tuple[float, ...],
     out: NDArray[np.float64] | None = None,
-    alpha: float = 1.0,
+    alpha: float | NDArray[np.float64] = 1.0,
     time_step: float = 1.0,
+    backend: str = "ndimage",
+    source: NDArray[np.float64] | None = None,
+    scratch: NDArray[np.float64] | None = None,
 ) -> NDArray[np.float64]:
     """Solve the 2D Heat Equation on a uniform mesh.
 
@@ -25,11 +113,22 @@ def solve_2d(
     spacing : array_like
         Grid spacing in the row and column directions.
     out : ndarray (optional)
-        Output array.
-    alpha : float (optional)
-        Thermal diffusivity.
+        Output array. If this is *temp*, *temp* is updated in place
+        using only three row-sized buffers (*backend* is then ignored).
+    alpha : float or ndarray (optional)
+        Thermal diffusivity, either uniform or per cell. A per-cell
+        diffusivity is applied through face conductances (*backend* is
+        then ignored).
     time_step : float (optional)
         Time step.
+    backend : str (optional)
+        Name of the stencil backend (see :mod:`heat.stencil`).
+    source : ndarray (optional)
+        Rate of change of temperature due to sources and sinks.
+    scratch : ndarray (optional)
+        Array used in place of temporary arrays: the size of the
+        interior of *temp* or, if *out* is *temp*, of shape
+        (3, *columns*). If not given, one is allocated as needed.
 
     Returns
     -------
@@ -42,29 +141,45 @@ def solve_2d(
     >>> z0 = np.zeros((3, 3))
     >>> z0[1:-1, 1:-1] = 1.
     >>> solve_2d(z0, (1., 1.), alpha=.25)
+    array([[0. , 0. , 0. ],
+           [0. , 0.5, 0. ],
+           [0. , 0. , 0. ]])
+    >>> solve_2d(z0, (1., 1.), alpha=.25, backend="numpy")
+    array([[0. , 0. , 0. ],
+           [0. , 0.5, 0. ],
+           [0. , 0. , 0. ]])
+    >>> q = np.full((3, 3), 2.)
+    >>> solve_2d(z0, (1., 1.), alpha=.25, source=q, backend="numpy")
+    array([[0. , 0. , 0. ],
+           [0. , 2.5, 0. ],
+           [0. , 0. , 0. ]])
+    >>> solve_2d(z0, (1., 1.), alpha=np.full((3, 3), .25))
     array([[0. , 0. , 0. ],
            [0. , 0.5, 0. ],
            [0. , 0. , 0. ]])
     """
-    dy2, dx2 = spacing[0] ** 2, spacing[1] ** 2
-    stencil = (
-        np.array([[0.0, dy2, 0.0], [dx2, -2.0 * (dx2 + dy2), dx2], [0.0, dy2, 0.0]])
-        * alpha
-        * time_step
-        / (2.0 * (dx2 * dy2))
-    )
-
     if out is None:
         out = np.empty_like(temp)
 
-    ndimage.convolve(temp, stencil, output=out)
-    out[(0, -1), :] = 0.0
-    out[:, (0, -1)] = 0.0
-    return np.add(temp, out, out=out)
+    if np.ndim(alpha) > 0:
+        conductances = _build_conductances(spacing, np.asarray(alpha, dtype=float))
+        if out is temp:
+            inplace_variable_kernel(temp, conductances, source, time_step, scratch)
+        else:
+            variable_kernel(temp, conductances, out, source, time_step, scratch)
+        return out
 
+    stencil = _build_stencil(spacing, float(alpha), time_step)
+    if out is temp:
+        if scratch is None:
+            scratch = np.empty((3, temp.shape[1]), dtype=temp.dtype)
+        inplace_kernel(temp, stencil, source, time_step, scratch)
+    else:
+        get_backend(backend)(temp, stencil, out, source, time_step, scratch)
+    return out
 
-class Heat:
 
+class Heat:
     """Solve the Heat equation on a grid.
 
     Examples
@@ -89,6 +204,12 @@ class Heat:
     >>> heat = Heat(alpha=.5, spacing=(2., 3.))
     >>> heat.time_step
     2.0
+
+    >>> alpha = np.ones((10, 20))
+    >>> alpha[:, 10:] = 2.
+    >>> heat = Heat(alpha=alpha)
+    >>> heat.time_step
+    0.125
     """
 
     def __init__(
@@ -96,7 +217,11 @@ class Heat:
         shape: tuple[int, int] = (10, 20),
         spacing: tuple[float, float] = (1.0, 1.0),
         origin: tuple[float, float] = (0.0, 0.0),
-        alpha: float = 1.0,
+        alpha: float | NDArray[np.float64] | str = 1.0,
+        backend: str | None = None,
+        low_memory: bool = False,
+        block_steps: int = 1,
+        tile_rows: int | None = None,
     ) -> None:
         """Create a new heat model.
 
@@ -108,24 +233,95 @@ class Heat:
             Spacing of grid rows and columns.
         origin : array_like, optional
             Coordinates of lower left corner of grid.
-        alpha : float
-            Alpha parameter in the heat equation.
+        alpha : float, ndarray or str, optional
+            Thermal diffusivity (alpha parameter in the heat equation).
+            Either uniform, per cell as an array of shape *shape*, or
+            the path to such an array saved as a ``.npy`` file. The time
+            step is set by the largest diffusivity.
+        backend : str, optional
+            Name of the stencil backend used to solve the heat equation,
+            *ndimage* by default. If ``"auto"``, choose the fastest
+            backend for the grid by timing each of them.
+        low_memory : bool, optional
+            Update the temperature in place rather than through a second
+            full-size array. Results are identical to those of the
+            *numpy* backend, the only backend (other than ``"auto"``)
+            allowed in this mode.
+        block_steps : int, optional
+            When advancing several time steps at once, advance the grid
+            this many steps at a time, strip by strip, so that each strip
+            is reused from cache (temporal blocking). Results are
+            identical to advancing one step at a time.
+        tile_rows : int, optional
+            Number of rows in a strip when *block_steps* is more than one.
+            By default, strips are sized so that their buffers fit in a
+            few MiB of cache.
         """
         self._shape = shape
         self._spacing = spacing
         self._origin = origin
         self._time = 0.0
-        self._alpha = alpha
-        self._time_step = min(spacing) ** 2 / (4.0 * self._alpha)
 
         self._temperature = np.random.random(self._shape)
-        self._next_temperature = np.empty_like(self._temperature)
+        self._rng = np.random.default_rng(np.random.randint(2**32, dtype=np.uint64))
+        self._next_temperature: NDArray[np.float64] | None
+        if low_memory:
+            if backend is not None and backend != "auto":
+                get_backend(backend)
+                if backend != "numpy":
+                    raise ValueError(
+                        f"{backend!r}: low-memory mode uses the 'numpy' backend"
+                    )
+            self._next_temperature = None
+            backend = "numpy"
+        else:
+            self._next_temperature = np.empty_like(self._temperature)
+            if backend is None:
+                backend = "ndimage"
+
+        self._initial_alpha: float | NDArray[np.float64]
+        self._diffusivity: NDArray[np.float64] | None = None
+        self._conductances: Conductances | None = None
+        self._scratch: NDArray[np.float64] | None = None
+        if isinstance(alpha, (str, os.PathLike)):
+            alpha = np.load(alpha)
+        if np.ndim(alpha) > 0:
+            self._initial_alpha = np.array(alpha, dtype=float)
+            if self._initial_alpha.shape != tuple(self._shape):
+                raise ValueError(
+                    f"{self._initial_alpha.shape}: diffusivity does not match"
+                    f" the shape of the grid, {tuple(self._shape)}"
+                )
+            self._diffusivity = self._initial_alpha.copy()
+            self.diffusivity_changed()
+        else:
+            self._initial_alpha = self._alpha = float(alpha)
+            self._time_step = min(spacing) ** 2 / (4.0 * self._alpha)
+
+        if backend == "auto" and self._next_temperature is not None:
+            backend = select_backend(self._temperature, self._next_temperature)
+        get_backend(backend)
+        self._backend = backend
+
+        self._source: NDArray[np.float64] | None = None
+        self._point_source_indices = np.empty(0, dtype=np.intp)
+        self._point_source_rates = np.empty(0)
+
+        self._probes: list[ProbeRecorder] = []
+
+        self._block_steps = block_steps
+        self._tile_rows = tile_rows
 
     @property
     def time(self) -> float:
         """Current model time."""
         return self._time
 
+    @time.setter
+    def time(self, time: float) -> None:
+        """Set the current model time."""
+        self._time = time
+
     @property
     def temperature(self) -> NDArray[np.float64]:
         """Temperature of the plate."""
@@ -142,6 +338,116 @@ class Heat:
         """
         self._temperature[:] = new_temp
 
+    @property
+    def source(self) -> NDArray[np.float64]:
+        """Rate of change of temperature due to sources and sinks.
+
+        The array is allocated, and included in the solution, the first
+        time it is accessed. Values on the boundary are ignored.
+        """
+        if self._source is None:
+            self._source = np.zeros_like(self._temperature)
+        return self._source
+
+    @source.setter
+    def source(self, new_source: float | NDArray[np.float64]) -> None:
+        """Set the rate of change of temperature due to sources and sinks."""
+        self.source[:] = new_source
+
+    @property
+    def diffusivity(self) -> NDArray[np.float64]:
+        """Thermal diffusivity of each cell.
+
+        The array is allocated the first time it is accessed. If it is
+        changed in place, rather than through the setter, call
+        :meth:`diffusivity_changed` before the next time step.
+        """
+        if self._diffusivity is None:
+            self._diffusivity = np.full_like(self._temperature, self._alpha)
+        return self._diffusivity
+
+    @diffusivity.setter
+    def diffusivity(self, new_diffusivity: float | NDArray[np.float64]) -> None:
+        """Set the thermal diffusivity of each cell."""
+        self.diffusivity[:] = new_diffusivity
+        self.diffusivity_changed()
+
+    def diffusivity_changed(self) -> None:
+        """Recompute the time step and face conductances from :attr:`diffusivity`.
+
+        A uniform diffusivity is solved with the model's stencil backend,
+        otherwise conductances are computed for the faces between cells
+        and kept until the diffusivity next changes.
+        """
+        diffusivity = self.diffusivity
+        lowest, highest = float(diffusivity.min()), float(diffusivity.max())
+        if lowest < 0.0 or not highest > 0.0:
+            raise ValueError(
+                f"({lowest}, {highest}): diffusivity must be non-negative and not"
+                " everywhere zero"
+            )
+
+        self._alpha = highest
+        self._time_step = min(self._spacing) ** 2 / (4.0 * self._alpha)
+
+        if lowest == highest:
+            self._conductances = None
+        else:
+            self._conductances = _build_conductances(self._spacing, diffusivity)
+
+    def set_point_sources(
+        self, indices: NDArray[np.int_], rates: float | NDArray[np.float64]
+    ) -> None:
+        """Set sources and sinks at a few cells.
+
+        Point sources are applied in addition to :attr:`source`, at a
+        cost proportional to the number of points. Sources on the
+        boundary are ignored.
+
+        Parameters
+        ----------
+        indices : array_like
+            Flat indices of the cells.
+        rates : array_like
+            Rate of change of temperature at each cell.
+        """
+        indices, rates = np.broadcast_arrays(
+            np.asarray(indices, dtype=np.intp), np.asarray(rates, dtype=float)
+        )
+        rows, cols = np.unravel_index(indices, self._shape)
+        interior = (
+            (rows > 0)
+            & (rows < self._shape[0] - 1)
+            & (cols > 0)
+            & (cols < self._shape[1] - 1)
+        )
+        self._point_source_indices = indices[interior].copy()
+        self._point_source_rates = rates[interior].copy()
+
+    def add_probes(
+        self, indices: NDArray[np.int_] | list[int], capacity: int
+    ) -> ProbeRecorder:
+        """Record the temperature at a set of cells after every time step.
+
+        Parameters
+        ----------
+        indices : array_like
+            Flat indices of the cells.
+        capacity : int
+            Number of time steps to keep.
+
+        Returns
+        -------
+        ProbeRecorder
+            The recorder, whose *times* and *values* hold the history.
+        """
+        recorder = ProbeRecorder(indices, capacity)
+        size = self._temperature.size
+        if np.any((recorder.indices < 0) | (recorder.indices >= size)):
+            raise ValueError(f"probe indices must be between 0 and {size - 1}")
+        self._probes.append(recorder)
+        return recorder
+
     @property
     def time_step(self) -> float:
         """Model time step."""
@@ -152,6 +458,11 @@ class Heat:
         """Set model time step."""
         self._time_step = time_step
 
+    @property
+    def backend(self) -> str:
+        """Name of the stencil backend."""
+        return self._backend
+
     @property
     def shape(self) -> tuple[int, int]:
         """Shape of the model grid."""
@@ -167,6 +478,30 @@ class Heat:
         """Origin coordinates of the model grid."""
         return self._origin
 
+    @property
+    def low_memory(self) -> bool:
+        """If the temperature is updated in place."""
+        return self._next_temperature is None
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the model's arrays."""
+        arrays = [
+            self._temperature,
+            self._next_temperature,
+            self._source,
+            self._point_source_indices,
+            self._point_source_rates,
+            self._diffusivity,
+            self._scratch,
+            *(self._conductances or ()),
+        ]
+        if isinstance(self._initial_alpha, np.ndarray):
+            arrays.append(self._initial_alpha)
+        return sum(array.nbytes for array in arrays if array is not None) + sum(
+            recorder.nbytes for recorder in self._probes
+        )
+
     @classmethod
     def from_file_like(cls: type[Heat], file_like: TextIOBase) -> Heat:
         """Create a Heat object from a file-like object.
@@ -184,15 +519,126 @@ class Heat:
         config = yaml.safe_load(file_like)
         return cls(**config)
 
-    def advance_in_time(self) -> None:
-        """Calculate new temperatures for the next time step."""
-        solve_2d(
+    def reset(self) -> None:
+        """Return the model to its initial state without reallocating.
+
+        The time, time step and diffusivity are restored, the temperature
+        is given new random values in place, and sources and probes are
+        removed (the recorders of removed probes are cleared). Random
+        values come from a generator seeded from :mod:`numpy.random` when
+        the model is created, so seeding that makes resets reproducible.
+        """
+        self._time = 0.0
+        if self._diffusivity is not None and not np.array_equal(
+            self._diffusivity, self._initial_alpha
+        ):
+            self.diffusivity = self._initial_alpha
+        else:
+            self._time_step = min(self._spacing) ** 2 / (4.0 * self._alpha)
+
+        self._rng.random(out=self._temperature)
+        if self._source is not None:
+            self._source.fill(0.0)
+        self._point_source_indices = np.empty(0, dtype=np.intp)
+        self._point_source_rates = np.empty(0)
+        for recorder in self._probes:
+            recorder.clear()
+        self._probes.clear()
+
+    def advance_in_time(self, n_steps: int = 1) -> None:
+        """Calculate new temperatures for the next time step(s).
+
+        Parameters
+        ----------
+        n_steps : int, optional
+            Number of time steps to advance.
+        """
+        blocked = (
+            self._block_steps > 1
+            and not self._probes
+            and len(self._point_source_indices) == 0
+            and self._conductances is None
+        )
+        while n_steps > 0:
+            if blocked and n_steps > 1:
+                n_block = min(self._block_steps, n_steps)
+                self._advance_blocked(n_block)
+            else:
+                n_block = 1
+                self._advance_one_step()
+            n_steps -= n_block
+
+    def _advance_blocked(self, n_steps: int) -> None:
+        """Advance several time steps with temporal blocking."""
+        tile_rows = self._tile_rows or default_tile_rows(self._temperature, n_steps)
+        advance_blocked(
+            get_backend(self._backend),
             self._temperature,
-            self._spacing,
-            out=self._next_temperature,
-            alpha=self._alpha,
-            time_step=self._time_step,
+            _build_stencil(self._spacing, self._alpha, self._time_step),
+            n_steps,
+            tile_rows,
+            source=self._source,
+            weight=self._time_step,
         )
-        np.copyto(self._temperature, self._next_temperature)
+        for _ in range(n_steps):
+            self._time += self._time_step
+
+    def _scratch_array(self) -> NDArray[np.float64]:
+        """Scratch space for the kernels, allocated on first use."""
+        if self._scratch is None:
+            rows, cols = self._shape
+            self._scratch = (
+                np.empty((3, cols))
+                if self.low_memory
+                else np.empty((rows - 2, cols - 2))
+            )
+        return self._scratch
+
+    def _advance_one_step(self) -> None:
+        """Advance one time step."""
+        next_temperature = (
+            self._temperature
+            if self._next_temperature is None
+            else self._next_temperature
+        )
+        if self._conductances is None:
+            solve_2d(
+                self._temperature,
+                self._spacing,
+                out=next_temperature,
+                alpha=self._alpha,
+                time_step=self._time_step,
+                backend=self._backend,
+                source=self._source,
+                scratch=self._scratch_array(),
+            )
+        elif next_temperature is self._temperature:
+            inplace_variable_kernel(
+                self._temperature,
+                self._conductances,
+                self._source,
+                self._time_step,
+                self._scratch_array(),
+            )
+        else:
+            variable_kernel(
+                self._temperature,
+                self._conductances,
+                next_temperature,
+                self._source,
+                self._time_step,
+                self._scratch_array(),
+            )
+        if len(self._point_source_indices) > 0:
+            np.add.at(
+                next_temperature.reshape(-1),
+                self._point_source_indices,
+                self._time_step * self._point_source_rates,
+            )
+        if next_temperature is not self._temperature:
+            np.copyto(self._temperature, next_temperature)
 
         self._time += self._time_step
+
+        for recorder in self._probes:
+            recorder.record(self._time, self._temperature)
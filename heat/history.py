@@ -0,0 +1,274 @@
+"""Keep a compressed, in-memory history of a field."""
+from __future__ import annotations
+
+import bisect
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def _shuffle(values: NDArray[np.uint64]) -> bytes:
+    """Group the bytes of 8-byte integers by significance, then compress."""
+    return zlib.compress(
+        np.ascontiguousarray(values.view(np.uint8).reshape((-1, 8)).T).tobytes(), 1
+    )
+
+
+def _unshuffle(data: bytes, out: NDArray[np.uint64]) -> None:
+    """Inverse of :func:`_shuffle`."""
+    shuffled = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+    out.view(np.uint8).reshape((-1, 8))[...] = shuffled.reshape((8, -1)).T
+
+
+def _zigzag(values: NDArray[np.uint64]) -> None:
+    """Map small signed integers to small unsigned integers, in place."""
+    signed = values.view(np.int64)
+    sign = signed >> 63
+    np.left_shift(signed, 1, out=signed)
+    np.bitwise_xor(signed, sign, out=signed)
+
+
+def _unzigzag(values: NDArray[np.uint64]) -> None:
+    """Inverse of :func:`_zigzag`, in place."""
+    sign = np.negative((values & 1).view(np.int64)).view(np.uint64)
+    np.right_shift(values, 1, out=values)
+    np.bitwise_xor(values, sign, out=values)
+
+
+class FieldHistory:
+    """A compressed history of snapshots of a field.
+
+    Each snapshot is stored as its difference from the previous one,
+    except for a keyframe every *keyframe_interval* snapshots. Differences
+    are the XOR of the floating point bit patterns (lossless) or, if an
+    *error_bound* is given, the zigzag-encoded differences of values
+    quantized to within that bound. The bytes of the differences are
+    grouped by significance and then compressed with zlib.
+
+    Examples
+    --------
+    >>> from heat.history import FieldHistory
+    >>> history = FieldHistory((2, 3))
+    >>> z = np.arange(6.0).reshape((2, 3))
+    >>> history.append(0.0, z)
+    >>> history.append(0.5, z + 1.0)
+    >>> len(history)
+    2
+    >>> history.get(1, np.empty((2, 3)))
+    array([[1., 2., 3.],
+           [4., 5., 6.]])
+    """
+
+    def __init__(
+        self,
+        shape: Sequence[int],
+        keyframe_interval: int = 32,
+        error_bound: float | None = None,
+    ) -> None:
+        """Create an empty history.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the field.
+        keyframe_interval : int, optional
+            Number of snapshots between keyframes. Reading a snapshot
+            decodes, at most, this many snapshots.
+        error_bound : float, optional
+            If given, store values only to within this absolute error.
+        """
+        if keyframe_interval < 1:
+            raise ValueError(f"{keyframe_interval}: keyframe interval must be positive")
+        if error_bound is not None and error_bound <= 0.0:
+            raise ValueError(f"{error_bound}: error bound must be positive")
+
+        self._shape = tuple(shape)
+        self._keyframe_interval = keyframe_interval
+        self._error_bound = error_bound
+
+        self._times: list[float] = []
+        self._frames: list[bytes] = []
+
+        self._previous = np.zeros(self._shape, dtype=np.uint64)
+        self._delta = np.empty(self._shape, dtype=np.uint64)
+
+        self._decoded = np.empty(self._shape, dtype=np.uint64)
+        self._decoded_index = -1
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def times(self) -> tuple[float, ...]:
+        """Times of the stored snapshots."""
+        return tuple(self._times)
+
+    @property
+    def error_bound(self) -> float | None:
+        """Maximum absolute error of stored values, or None if lossless."""
+        return self._error_bound
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the compressed snapshots."""
+        return sum(len(frame) for frame in self._frames)
+
+    @property
+    def raw_nbytes(self) -> int:
+        """Number of bytes the snapshots would take uncompressed."""
+        return len(self._frames) * self._previous.nbytes
+
+    def _encode(
+        self, field: NDArray[np.float64], out: NDArray[np.uint64]
+    ) -> NDArray[np.uint64]:
+        """Bit pattern, or quantized value, of a field."""
+        if self._error_bound is None:
+            np.copyto(out, np.asarray(field, dtype=np.float64).view(np.uint64))
+        else:
+            quantized = np.rint(np.divide(field, 2.0 * self._error_bound))
+            np.copyto(out, quantized.astype(np.int64).view(np.uint64))
+        return out
+
+    def _decode(
+        self, encoded: NDArray[np.uint64], out: NDArray[np.float64]
+    ) -> NDArray[np.float64]:
+        """Field from its bit pattern, or quantized value."""
+        if self._error_bound is None:
+            np.copyto(out, encoded.view(np.float64))
+        else:
+            np.multiply(encoded.view(np.int64), 2.0 * self._error_bound, out=out)
+        return out
+
+    def _combine(self, previous: NDArray[np.uint64], delta: NDArray[np.uint64]) -> None:
+        """Apply a difference to the previous snapshot, in place."""
+        if self._error_bound is None:
+            np.bitwise_xor(previous, delta, out=previous)
+        else:
+            _unzigzag(delta)
+            np.add(previous, delta, out=previous)
+
+    def append(self, time: float, field: NDArray[np.float64]) -> None:
+        """Compress and store a snapshot.
+
+        Parameters
+        ----------
+        time : float
+            Time of the snapshot.
+        field : ndarray
+            Values of the field. With an error bound, their magnitudes
+            must be finite and less than :math:`2^{63}` times the bound.
+        """
+        if self._error_bound is not None:
+            largest = float(np.abs(field).max())
+            limit = 2.0 * self._error_bound * 2.0**62
+            if not largest < limit:
+                raise ValueError(
+                    f"{largest}: value too large to store to within"
+                    f" {self._error_bound} (must be less than {limit})"
+                )
+        current = self._encode(field, self._delta)
+        if len(self._frames) % self._keyframe_interval == 0:
+            self._previous.fill(0)
+
+        if self._error_bound is None:
+            np.bitwise_xor(current, self._previous, out=self._previous)
+        else:
+            np.subtract(current, self._previous, out=self._previous)
+            _zigzag(self._previous)
+        self._frames.append(_shuffle(self._previous))
+        self._times.append(time)
+
+        self._previous, self._delta = self._delta, self._previous
+
+    def get(self, index: int, out: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Decompress a snapshot into a caller's array.
+
+        Parameters
+        ----------
+        index : int
+            Index of the snapshot.
+        out : ndarray
+            Array into which to place the values.
+
+        Returns
+        -------
+        ndarray
+            The values of the snapshot.
+        """
+        index = range(len(self._frames))[index]
+        self._decode(self._reconstruct(index), out.reshape(self._shape))
+        return out
+
+    def _reconstruct(self, index: int) -> NDArray[np.uint64]:
+        """Encoded values of a snapshot, starting from the last one read."""
+        keyframe = index - index % self._keyframe_interval
+
+        if keyframe <= self._decoded_index <= index:
+            start = self._decoded_index + 1
+        else:
+            start = keyframe
+            self._decoded.fill(0)
+
+        for frame in range(start, index + 1):
+            _unshuffle(self._frames[frame], self._delta)
+            self._combine(self._decoded, self._delta)
+        self._decoded_index = index
+
+        return self._decoded
+
+    def get_at_time(self, time: float, out: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Decompress the snapshot taken at a particular time.
+
+        Parameters
+        ----------
+        time : float
+            Time of the snapshot.
+        out : ndarray
+            Array into which to place the values.
+
+        Returns
+        -------
+        ndarray
+            The values of the snapshot.
+        """
+        index = int(np.searchsorted(self._times, time))
+        nearest = min(
+            (i for i in (index - 1, index) if 0 <= i < len(self._times)),
+            key=lambda i: abs(self._times[i] - time),
+            default=None,
+        )
+        if nearest is None or not np.isclose(
+            self._times[nearest], time, rtol=1e-9, atol=1e-12
+        ):
+            raise KeyError(f"{time}: no snapshot at this time")
+        return self.get(nearest, out)
+
+    def truncate(self, time: float) -> None:
+        """Remove the snapshots taken after a time.
+
+        Use this when a model is rolled back, so that snapshots remain in
+        time order and later snapshots are appended after *time*.
+
+        Parameters
+        ----------
+        time : float
+            Time of the last snapshot to keep.
+        """
+        count = bisect.bisect_right(self._times, time)
+        if count == len(self._frames):
+            return
+
+        del self._times[count:]
+        del self._frames[count:]
+        if count > 0:
+            np.copyto(self._previous, self._reconstruct(count - 1))
+        else:
+            self._decoded_index = -1
+
+    def clear(self) -> None:
+        """Remove all snapshots."""
+        self._times.clear()
+        self._frames.clear()
+        self._decoded_index = -1
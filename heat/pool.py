@@ -0,0 +1,106 @@
+"""Reuse initialized heat models."""
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .bmi_heat import BmiHeat
+from .heat import load_config
+
+
+class BmiHeatPool:
+    """A pool of initialized BmiHeat models, keyed by configuration.
+
+    Models handed back to the pool are kept, and reset rather than
+    reinitialized, when a model with the same configuration is next
+    requested.
+
+    Examples
+    --------
+    >>> from heat import BmiHeatPool
+    >>> pool = BmiHeatPool()
+    >>> model = pool.acquire()
+    >>> model.update()
+    >>> pool.release(model)
+    >>> len(pool)
+    1
+    >>> pool.acquire() is model
+    True
+    >>> model.get_current_time()
+    0.0
+    """
+
+    def __init__(self, max_idle: int | None = None) -> None:
+        """Create an empty pool.
+
+        Parameters
+        ----------
+        max_idle : int, optional
+            Maximum number of idle models kept for each configuration.
+            Models released beyond this are finalized.
+        """
+        self._max_idle = max_idle
+        self._idle: dict[str, list[BmiHeat]] = {}
+        self._keys: dict[BmiHeat, str] = {}
+
+    def __len__(self) -> int:
+        """Number of idle models."""
+        return sum(len(models) for models in self._idle.values())
+
+    def acquire(self, filename: str | None = None) -> BmiHeat:
+        """Get a model in its initial state.
+
+        Parameters
+        ----------
+        filename : str, optional
+            Path to name of input file.
+
+        Returns
+        -------
+        BmiHeat
+            An initialized model.
+        """
+        key = json.dumps(
+            {} if filename is None else load_config(filename), sort_keys=True
+        )
+        idle = self._idle.get(key)
+        if idle:
+            model = idle.pop()
+            model.reset(filename)
+        else:
+            model = BmiHeat()
+            model.initialize(filename)
+        self._keys[model] = key
+        return model
+
+    def release(self, model: BmiHeat) -> None:
+        """Hand a model back to the pool.
+
+        Parameters
+        ----------
+        model : BmiHeat
+            A model obtained from :meth:`acquire`.
+        """
+        key = self._keys.pop(model)
+        idle = self._idle.setdefault(key, [])
+        if self._max_idle is None or len(idle) < self._max_idle:
+            idle.append(model)
+        else:
+            model.finalize()
+
+    @contextmanager
+    def model(self, filename: str | None = None) -> Iterator[BmiHeat]:
+        """Borrow a model from the pool for the duration of a block."""
+        model = self.acquire(filename)
+        try:
+            yield model
+        finally:
+            self.release(model)
+
+    def clear(self) -> None:
+        """Finalize all idle models."""
+        for models in self._idle.values():
+            for model in models:
+                model.finalize()
+        self._idle.clear()
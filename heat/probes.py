@@ -0,0 +1,103 @@
+"""Record the values of a field at fixed locations."""
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class ProbeRecorder:
+    """Record values at a fixed set of cells into a ring buffer.
+
+    Each record is written twice, to its slot in each half of a buffer
+    twice the capacity, so that the most recent records are always a
+    contiguous, time-ordered slice that can be returned without copying.
+
+    Examples
+    --------
+    >>> from heat.probes import ProbeRecorder
+    >>> recorder = ProbeRecorder([0, 3], capacity=2)
+    >>> z = np.arange(4.0)
+    >>> for time in (1.0, 2.0, 3.0):
+    ...     recorder.record(time, z * time)
+    >>> recorder.times
+    array([2., 3.])
+    >>> recorder.values
+    array([[0., 6.],
+           [0., 9.]])
+    """
+
+    def __init__(self, indices: NDArray[np.int_] | list[int], capacity: int) -> None:
+        """Create a probe recorder.
+
+        Parameters
+        ----------
+        indices : array_like
+            Flat indices of the cells to record.
+        capacity : int
+            Number of records to keep. Once full, the oldest record is
+            overwritten.
+        """
+        if capacity < 1:
+            raise ValueError(f"{capacity}: capacity must be positive")
+        self._indices = np.array(indices, dtype=np.intp).reshape(-1)
+        self._capacity = capacity
+        self._times = np.empty(2 * capacity)
+        self._values = np.empty((2 * capacity, len(self._indices)))
+        self._count = 0
+
+    @property
+    def indices(self) -> NDArray[np.intp]:
+        """Flat indices of the probed cells."""
+        return self._indices
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of records kept."""
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        """Total number of records made."""
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the recorder's buffers."""
+        return self._indices.nbytes + self._times.nbytes + self._values.nbytes
+
+    def _window(self) -> slice:
+        if self._count < self._capacity:
+            return slice(0, self._count)
+        start = self._count % self._capacity
+        return slice(start, start + self._capacity)
+
+    @property
+    def times(self) -> NDArray[np.float64]:
+        """Times of the kept records, oldest first (a view)."""
+        return self._times[self._window()]
+
+    @property
+    def values(self) -> NDArray[np.float64]:
+        """Kept records as an array of (*records*, *probes*) (a view)."""
+        return self._values[self._window()]
+
+    def clear(self) -> None:
+        """Discard all records."""
+        self._count = 0
+
+    def record(self, time: float, field: NDArray[np.float64]) -> None:
+        """Record the probed values of a field.
+
+        Parameters
+        ----------
+        time : float
+            Time of the record.
+        field : ndarray
+            Field from which to take values.
+        """
+        slot = self._count % self._capacity
+        row = self._values[slot]
+        np.take(field.reshape(-1), self._indices, out=row)
+        self._values[slot + self._capacity] = row
+        self._times[slot] = self._times[slot + self._capacity] = time
+        self._count += 1
@@ -0,0 +1,127 @@
+"""Coarsened, block-averaged views of a field."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def block_average(
+    values: NDArray[np.float64], factor: int, out: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    """Average a 2D array over non-overlapping square blocks.
+
+    Rows and columns left over after the last whole block are ignored.
+
+    Parameters
+    ----------
+    values : ndarray
+        The array to coarsen.
+    factor : int
+        Number of rows and columns in each block.
+    out : ndarray, optional
+        Output array.
+
+    Returns
+    -------
+    ndarray
+        The block averages.
+
+    Examples
+    --------
+    >>> from heat.pyramid import block_average
+    >>> block_average(np.arange(20.0).reshape((4, 5)), 2)
+    array([[ 3.,  5.],
+           [13., 15.]])
+    """
+    n_rows, n_cols = values.shape[0] // factor, values.shape[1] // factor
+    blocks = values[: n_rows * factor, : n_cols * factor].reshape(
+        (n_rows, factor, n_cols, factor)
+    )
+    if out is None:
+        out = np.empty((n_rows, n_cols), dtype=values.dtype)
+    return blocks.mean(axis=(1, 3), out=out)
+
+
+class Pyramid:
+    """Lazily computed, cached block averages of a field at several factors.
+
+    Examples
+    --------
+    >>> from heat.pyramid import Pyramid
+    >>> z = np.arange(16.0).reshape((4, 4))
+    >>> pyramid = Pyramid(z, (2, 4))
+    >>> pyramid.level(4)
+    array([[7.5]])
+    >>> z[:] = 0.0
+    >>> pyramid.level(4)
+    array([[7.5]])
+    >>> pyramid.invalidate()
+    >>> pyramid.level(4)
+    array([[0.]])
+    """
+
+    def __init__(self, values: NDArray[np.float64], factors: Iterable[int]) -> None:
+        """Create coarsened versions of a field.
+
+        Parameters
+        ----------
+        values : ndarray
+            The field to coarsen. Block averages are taken from this
+            array, so it should be updated in place.
+        factors : iterable of int
+            Coarsening factors.
+        """
+        self._values = values
+        self._levels: dict[int, NDArray[np.float64]] = {}
+        for factor in sorted(set(factors)):
+            shape = (values.shape[0] // factor, values.shape[1] // factor)
+            if factor < 2 or min(shape) < 1:
+                raise ValueError(
+                    f"{factor}: coarsening factor must be between 2 and the"
+                    f" number of rows and columns"
+                )
+            self._levels[factor] = np.empty(shape, dtype=values.dtype)
+        self._fresh: set[int] = set()
+
+    @property
+    def factors(self) -> tuple[int, ...]:
+        """Coarsening factors, from finest to coarsest."""
+        return tuple(self._levels)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the coarsened levels."""
+        return sum(level.nbytes for level in self._levels.values())
+
+    def buffer(self, factor: int) -> NDArray[np.float64]:
+        """Storage for a level, without bringing it up to date."""
+        return self._levels[factor]
+
+    def invalidate(self) -> None:
+        """Mark all levels as out of date."""
+        self._fresh.clear()
+
+    def level(self, factor: int) -> NDArray[np.float64]:
+        """Block averages of the field, computed only if out of date.
+
+        Parameters
+        ----------
+        factor : int
+            Coarsening factor.
+
+        Returns
+        -------
+        ndarray
+            The (cached) coarsened field.
+        """
+        out = self._levels[factor]
+        if factor not in self._fresh:
+            source, source_factor = self._values, 1
+            for finer in self._fresh:
+                if factor % finer == 0 and finer > source_factor:
+                    source, source_factor = self._levels[finer], finer
+            block_average(source, factor // source_factor, out=out)
+            self._fresh.add(factor)
+        return out
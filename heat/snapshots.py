@@ -0,0 +1,136 @@
+"""Keep in-memory snapshots of model state."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class SnapshotRing:
+    """A bounded set of named snapshots held in preallocated buffers.
+
+    When all buffers are in use, saving a new snapshot evicts the one that
+    was least recently saved or restored.
+
+    Examples
+    --------
+    >>> from heat.snapshots import SnapshotRing
+    >>> ring = SnapshotRing((2,), capacity=2)
+    >>> z = np.array([1.0, 2.0])
+    >>> ring.save("a", z, time=0.0, time_step=0.5)
+    >>> ring.save("b", z * 2, time=1.0, time_step=0.5)
+    >>> ring.restore("a", z)
+    (0.0, 0.5)
+    >>> ring.save("c", z * 3, time=2.0, time_step=0.5)
+    >>> ring.names
+    ('a', 'c')
+    """
+
+    def __init__(
+        self,
+        shape: Sequence[int],
+        capacity: int,
+        dtype: np.dtype[np.float64] | type[np.float64] = np.float64,
+    ) -> None:
+        """Allocate buffers for snapshots.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the saved field.
+        capacity : int
+            Maximum number of snapshots.
+        dtype : dtype, optional
+            Type of the saved field.
+        """
+        if capacity < 1:
+            raise ValueError(f"{capacity}: capacity must be positive")
+        self._fields = np.empty((capacity, *shape), dtype=dtype)
+        self._times = np.empty(capacity)
+        self._time_steps = np.empty(capacity)
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of snapshots."""
+        return len(self._fields)
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Names of the snapshots, least recently used first."""
+        return tuple(self._slots)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the snapshot buffers."""
+        return self._fields.nbytes + self._times.nbytes + self._time_steps.nbytes
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def save(
+        self, name: str, field: NDArray[np.float64], time: float, time_step: float
+    ) -> None:
+        """Save a snapshot, replacing any with the same name.
+
+        Parameters
+        ----------
+        name : str
+            Name of the snapshot.
+        field : ndarray
+            Field to save.
+        time : float
+            Model time.
+        time_step : float
+            Model time step.
+        """
+        if name in self._slots:
+            slot = self._slots.pop(name)
+        elif self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+
+        np.copyto(self._fields[slot], field)
+        self._times[slot] = time
+        self._time_steps[slot] = time_step
+        self._slots[name] = slot
+
+    def restore(self, name: str, field: NDArray[np.float64]) -> tuple[float, float]:
+        """Copy a snapshot into a field.
+
+        Parameters
+        ----------
+        name : str
+            Name of the snapshot.
+        field : ndarray
+            Field into which to copy the saved values.
+
+        Returns
+        -------
+        tuple of float
+            The saved time and time step.
+        """
+        try:
+            slot = self._slots[name]
+        except KeyError:
+            raise KeyError(f"{name!r}: no snapshot with this name") from None
+        self._slots.move_to_end(name)
+
+        np.copyto(field, self._fields[slot])
+        return float(self._times[slot]), float(self._time_steps[slot])
+
+    def discard(self, name: str) -> None:
+        """Remove a snapshot."""
+        self._free.append(self._slots.pop(name))
+
+    def clear(self) -> None:
+        """Remove all snapshots."""
+        self._free.extend(self._slots.values())
+        self._slots.clear()
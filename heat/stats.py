@@ -0,0 +1,112 @@
+"""Running, per-cell statistics of a field."""
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class RunningStatistics:
+    """Accumulate the per-cell mean, variance, minimum and maximum of a field.
+
+    The accumulators are updated in place with Welford's algorithm so that
+    adding a sample does not allocate.
+
+    Examples
+    --------
+    >>> from heat.stats import RunningStatistics
+    >>> stats = RunningStatistics(np.array([1.0, 2.0]))
+    >>> stats.add(np.array([3.0, 2.0]))
+    >>> stats.add(np.array([2.0, 5.0]))
+    >>> stats.count
+    3
+    >>> stats.mean
+    array([2., 3.])
+    >>> stats.variance
+    array([0.66666667, 2.        ])
+    >>> stats.minimum, stats.maximum
+    (array([1., 2.]), array([3., 5.]))
+    """
+
+    def __init__(self, values: NDArray[np.float64]) -> None:
+        """Start accumulating statistics.
+
+        Parameters
+        ----------
+        values : ndarray
+            The first sample.
+        """
+        self._mean = np.empty_like(values)
+        self._variance = np.empty_like(values)
+        self._minimum = np.empty_like(values)
+        self._maximum = np.empty_like(values)
+        self._delta = np.empty_like(values)
+        self._scratch = np.empty_like(values)
+        self.reset(values)
+
+    @property
+    def count(self) -> int:
+        """Number of samples."""
+        return self._count
+
+    @property
+    def mean(self) -> NDArray[np.float64]:
+        """Per-cell mean of the samples."""
+        return self._mean
+
+    @property
+    def variance(self) -> NDArray[np.float64]:
+        """Per-cell (population) variance of the samples."""
+        return self._variance
+
+    @property
+    def minimum(self) -> NDArray[np.float64]:
+        """Per-cell minimum of the samples."""
+        return self._minimum
+
+    @property
+    def maximum(self) -> NDArray[np.float64]:
+        """Per-cell maximum of the samples."""
+        return self._maximum
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the accumulators and scratch arrays."""
+        return 6 * self._mean.nbytes
+
+    def reset(self, values: NDArray[np.float64]) -> None:
+        """Discard all samples and start again from *values*.
+
+        Parameters
+        ----------
+        values : ndarray
+            The first sample.
+        """
+        self._count = 1
+        np.copyto(self._mean, values)
+        self._variance.fill(0.0)
+        np.copyto(self._minimum, values)
+        np.copyto(self._maximum, values)
+
+    def add(self, values: NDArray[np.float64]) -> None:
+        """Add a sample.
+
+        Parameters
+        ----------
+        values : ndarray
+            The new sample.
+        """
+        self._count += 1
+        n = self._count
+
+        np.subtract(values, self._mean, out=self._delta)
+        np.multiply(self._delta, 1.0 / n, out=self._scratch)
+        self._mean += self._scratch
+
+        np.subtract(values, self._mean, out=self._scratch)
+        self._scratch *= self._delta
+        self._scratch *= 1.0 / n
+        self._variance *= (n - 1.0) / n
+        self._variance += self._scratch
+
+        np.minimum(self._minimum, values, out=self._minimum)
+        np.maximum(self._maximum, values, out=self._maximum)
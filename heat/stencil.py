@@ -0,0 +1,578 @@
+"""Interchangeable implementations of the heat-equation stencil."""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import time
+from collections.abc import Callable
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy import ndimage
+
+StencilKernel = Callable[
+    [
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64] | None,
+        float,
+        NDArray[np.float64] | None,
+    ],
+    None,
+]
+
+Conductances = tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]
+
+_BACKENDS: dict[str, StencilKernel] = {}
+
+
+def register_backend(
+    name: str,
+) -> Callable[[StencilKernel], StencilKernel]:
+    """Register a stencil kernel under *name*.
+
+    A kernel is called as
+    ``kernel(temp, stencil, out, source, weight, scratch)`` and must fill
+    the interior of *out* with *temp* plus the convolution of *temp* with
+    the 3x3 *stencil*, plus, if *source* is not ``None``, *weight* times
+    *source*. The boundary of *temp* is copied into *out*. *scratch*, if
+    not ``None``, is an array the size of the interior of *temp* that the
+    kernel may use in place of temporary arrays.
+
+    Parameters
+    ----------
+    name : str
+        Name of the backend.
+
+    Returns
+    -------
+    callable
+        A decorator that registers its argument.
+    """
+
+    def _register(kernel: StencilKernel) -> StencilKernel:
+        _BACKENDS[name] = kernel
+        return kernel
+
+    return _register
+
+
+def available_backends() -> tuple[str, ...]:
+    """Names of the registered stencil backends.
+
+    Examples
+    --------
+    >>> from heat.stencil import available_backends
+    >>> "ndimage" in available_backends()
+    True
+    """
+    return tuple(_BACKENDS)
+
+
+def get_backend(name: str) -> StencilKernel:
+    """Look up a stencil kernel by name.
+
+    Parameters
+    ----------
+    name : str
+        Name of the backend.
+
+    Returns
+    -------
+    callable
+        The stencil kernel.
+    """
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"{name!r}: unknown stencil backend (not one of"
+            f" {', '.join(available_backends())})"
+        ) from None
+
+
+@register_backend("ndimage")
+def _ndimage_kernel(
+    temp: NDArray[np.float64],
+    stencil: NDArray[np.float64],
+    out: NDArray[np.float64],
+    source: NDArray[np.float64] | None,
+    weight: float,
+    scratch: NDArray[np.float64] | None = None,
+) -> None:
+    ndimage.convolve(temp, stencil, output=out)
+    out[(0, -1), :] = 0.0
+    out[:, (0, -1)] = 0.0
+    if source is not None:
+        if scratch is None:
+            scratch = np.empty_like(out[1:-1, 1:-1])
+        np.multiply(source[1:-1, 1:-1], weight, out=scratch)
+        out[1:-1, 1:-1] += scratch
+    np.add(temp, out, out=out)
+
+
+@register_backend("numpy")
+def _numpy_kernel(
+    temp: NDArray[np.float64],
+    stencil: NDArray[np.float64],
+    out: NDArray[np.float64],
+    source: NDArray[np.float64] | None,
+    weight: float,
+    scratch: NDArray[np.float64] | None = None,
+) -> None:
+    interior = out[1:-1, 1:-1]
+    if scratch is None:
+        scratch = np.empty_like(interior)
+    _weighted_sum(
+        interior,
+        scratch,
+        None if source is None else source[1:-1, 1:-1],
+        weight,
+        (1.0 + stencil[1, 1], temp[1:-1, 1:-1]),
+        (stencil[0, 1], temp[2:, 1:-1]),
+        (stencil[2, 1], temp[:-2, 1:-1]),
+        (stencil[1, 0], temp[1:-1, 2:]),
+        (stencil[1, 2], temp[1:-1, :-2]),
+    )
+
+    out[(0, -1), :] = temp[(0, -1), :]
+    out[:, (0, -1)] = temp[:, (0, -1)]
+
+
+def _weighted_sum(
+    out: NDArray[np.float64],
+    scratch: NDArray[np.float64],
+    source: NDArray[np.float64] | None,
+    weight: float,
+    *terms: tuple[float, NDArray[np.float64]],
+) -> None:
+    """Sum the source and weighted neighbors into *out*, without temporaries."""
+    if source is None:
+        np.multiply(terms[0][1], terms[0][0], out=out)
+    else:
+        np.multiply(source, weight, out=out)
+        np.multiply(terms[0][1], terms[0][0], out=scratch)
+        out += scratch
+    for coefficient, values in terms[1:]:
+        np.multiply(values, coefficient, out=scratch)
+        out += scratch
+
+
+def inplace_kernel(
+    temp: NDArray[np.float64],
+    stencil: NDArray[np.float64],
+    source: NDArray[np.float64] | None,
+    weight: float,
+    lines: NDArray[np.float64],
+) -> None:
+    """Apply the stencil to an array in place, one row at a time.
+
+    The old values of the previous and current rows are kept in two
+    row buffers so that the result is identical to that of the *numpy*
+    backend, which writes to a separate output array. A third row
+    buffer stands in for temporary arrays.
+
+    Parameters
+    ----------
+    temp : ndarray
+        Array to update.
+    stencil : ndarray
+        The 3x3 stencil.
+    source : ndarray or None
+        Source term.
+    weight : float
+        Weight of the source term.
+    lines : ndarray
+        Scratch array of shape (3, *columns*).
+    """
+    previous, current, scratch = lines[0], lines[1], lines[2, 1:-1]
+    np.copyto(previous, temp[0])
+    for row in range(1, temp.shape[0] - 1):
+        np.copyto(current, temp[row])
+        _weighted_sum(
+            temp[row, 1:-1],
+            scratch,
+            None if source is None else source[row, 1:-1],
+            weight,
+            (1.0 + stencil[1, 1], current[1:-1]),
+            (stencil[0, 1], temp[row + 1, 1:-1]),
+            (stencil[2, 1], previous[1:-1]),
+            (stencil[1, 0], current[2:]),
+            (stencil[1, 2], current[:-2]),
+        )
+        previous, current = current, previous
+
+
+def variable_kernel(
+    temp: NDArray[np.float64],
+    conductances: Conductances,
+    out: NDArray[np.float64],
+    source: NDArray[np.float64] | None,
+    weight: float,
+    scratch: NDArray[np.float64] | None = None,
+) -> None:
+    """Apply a variable-coefficient stencil.
+
+    *conductances* are the conductances of the faces between rows, an
+    array of (*rows* - 1, *columns* - 2), of the faces between columns,
+    an array of (*rows* - 2, *columns* - 1), and their sum about each
+    interior cell. The interior of *out* is filled with *temp* plus
+    *weight* times the net flux into each cell plus *source*. The
+    boundary of *temp* is copied into *out*.
+
+    Parameters
+    ----------
+    temp : ndarray
+        Input array.
+    conductances : tuple of ndarray
+        Face conductances, per unit time.
+    out : ndarray
+        Output array.
+    source : ndarray or None
+        Source term.
+    weight : float
+        Time step.
+    scratch : ndarray, optional
+        Scratch array the size of the interior of *temp*.
+    """
+    row_faces, col_faces, total = conductances
+    if scratch is None:
+        scratch = np.empty_like(total)
+
+    center = temp[1:-1, 1:-1]
+    interior = out[1:-1, 1:-1]
+    np.multiply(total, center, out=interior)
+    np.negative(interior, out=interior)
+    for faces, neighbors in (
+        (row_faces[:-1], temp[:-2, 1:-1]),
+        (row_faces[1:], temp[2:, 1:-1]),
+        (col_faces[:, :-1], temp[1:-1, :-2]),
+        (col_faces[:, 1:], temp[1:-1, 2:]),
+    ):
+        np.multiply(faces, neighbors, out=scratch)
+        interior += scratch
+    if source is not None:
+        interior += source[1:-1, 1:-1]
+    interior *= weight
+    interior += center
+
+    out[(0, -1), :] = temp[(0, -1), :]
+    out[:, (0, -1)] = temp[:, (0, -1)]
+
+
+def inplace_variable_kernel(
+    temp: NDArray[np.float64],
+    conductances: Conductances,
+    source: NDArray[np.float64] | None,
+    weight: float,
+    lines: NDArray[np.float64] | None = None,
+) -> None:
+    """Apply a variable-coefficient stencil in place, one row at a time.
+
+    The result is identical to that of :func:`variable_kernel`.
+
+    Parameters
+    ----------
+    temp : ndarray
+        Array to update.
+    conductances : tuple of ndarray
+        Face conductances, per unit time (see :func:`variable_kernel`).
+    source : ndarray or None
+        Source term.
+    weight : float
+        Time step.
+    lines : ndarray, optional
+        Scratch array of shape (3, *columns*).
+    """
+    row_faces, col_faces, total = conductances
+    if lines is None:
+        lines = np.empty((3, temp.shape[1]), dtype=temp.dtype)
+
+    previous, current, scratch = lines[0], lines[1], lines[2, 1:-1]
+    np.copyto(previous, temp[0])
+    for row in range(1, temp.shape[0] - 1):
+        np.copyto(current, temp[row])
+        interior = temp[row, 1:-1]
+        np.multiply(total[row - 1], current[1:-1], out=interior)
+        np.negative(interior, out=interior)
+        for faces, neighbors in (
+            (row_faces[row - 1], previous[1:-1]),
+            (row_faces[row], temp[row + 1, 1:-1]),
+            (col_faces[row - 1, :-1], current[:-2]),
+            (col_faces[row - 1, 1:], current[2:]),
+        ):
+            np.multiply(faces, neighbors, out=scratch)
+            interior += scratch
+        if source is not None:
+            interior += source[row, 1:-1]
+        interior *= weight
+        interior += current[1:-1]
+        previous, current = current, previous
+
+
+try:
+    import numba  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    pass
+else:  # pragma: no cover
+
+    @numba.njit(cache=True, nogil=True)
+    def _numba_loop(
+        temp: NDArray[np.float64],
+        stencil: NDArray[np.float64],
+        out: NDArray[np.float64],
+        source: NDArray[np.float64] | None,
+        weight: float,
+    ) -> None:
+        n_rows, n_cols = temp.shape
+        center = 1.0 + stencil[1, 1]
+        if source is None:
+            for row in range(1, n_rows - 1):
+                for col in range(1, n_cols - 1):
+                    out[row, col] = (
+                        center * temp[row, col]
+                        + stencil[0, 1] * temp[row + 1, col]
+                        + stencil[2, 1] * temp[row - 1, col]
+                        + stencil[1, 0] * temp[row, col + 1]
+                        + stencil[1, 2] * temp[row, col - 1]
+                    )
+        else:
+            for row in range(1, n_rows - 1):
+                for col in range(1, n_cols - 1):
+                    out[row, col] = (
+                        center * temp[row, col]
+                        + stencil[0, 1] * temp[row + 1, col]
+                        + stencil[2, 1] * temp[row - 1, col]
+                        + stencil[1, 0] * temp[row, col + 1]
+                        + stencil[1, 2] * temp[row, col - 1]
+                        + weight * source[row, col]
+                    )
+        for col in range(n_cols):
+            out[0, col] = temp[0, col]
+            out[n_rows - 1, col] = temp[n_rows - 1, col]
+        for row in range(n_rows):
+            out[row, 0] = temp[row, 0]
+            out[row, n_cols - 1] = temp[row, n_cols - 1]
+
+    @register_backend("numba")
+    def _numba_kernel(
+        temp: NDArray[np.float64],
+        stencil: NDArray[np.float64],
+        out: NDArray[np.float64],
+        source: NDArray[np.float64] | None,
+        weight: float,
+        scratch: NDArray[np.float64] | None = None,
+    ) -> None:
+        _numba_loop(temp, stencil, out, source, weight)
+
+
+def default_tile_rows(
+    temp: NDArray[np.float64], n_steps: int, cache_bytes: int = 8 << 20
+) -> int:
+    """Number of rows in a strip for :func:`advance_blocked`.
+
+    Strips are sized so that the three strip buffers fit in *cache_bytes*,
+    but are at least 8 times the halo so that little work is redone.
+
+    Examples
+    --------
+    >>> from heat.stencil import default_tile_rows
+    >>> default_tile_rows(np.empty((8192, 8192)), 8)
+    64
+    >>> default_tile_rows(np.empty((512, 512)), 8)
+    666
+    """
+    row_bytes = temp.shape[1] * temp.itemsize
+    return max(8 * n_steps, cache_bytes // (3 * row_bytes) - 2 * n_steps)
+
+
+def advance_blocked(
+    kernel: StencilKernel,
+    temp: NDArray[np.float64],
+    stencil: NDArray[np.float64],
+    n_steps: int,
+    tile_rows: int,
+    source: NDArray[np.float64] | None = None,
+    weight: float = 1.0,
+) -> None:
+    """Advance an array several steps in place, one strip of rows at a time.
+
+    Each strip of *tile_rows* rows is copied, along with *n_steps* halo
+    rows on either side, into a small buffer that is advanced all
+    *n_steps* steps before the next strip is started, so that the array
+    streams through memory once rather than once per step. Halo rows are
+    recomputed by neighboring strips and discarded; the result is
+    identical to applying *kernel* *n_steps* times to the whole array.
+
+    Parameters
+    ----------
+    kernel : callable
+        Stencil kernel.
+    temp : ndarray
+        Array to update.
+    stencil : ndarray
+        The 3x3 stencil.
+    n_steps : int
+        Number of steps.
+    tile_rows : int
+        Number of rows in a strip. Strips are made at least *n_steps*
+        rows high.
+    source : ndarray, optional
+        Source term.
+    weight : float, optional
+        Weight of the source term.
+    """
+    n_rows = temp.shape[0]
+    halo = n_steps
+    tile_rows = max(tile_rows, halo, 1)
+    buffers = [
+        np.empty((min(tile_rows + 2 * halo, n_rows), temp.shape[1]), dtype=temp.dtype)
+        for _ in range(3)
+    ]
+    scratch = np.empty((buffers[0].shape[0] - 2, temp.shape[1] - 2), dtype=temp.dtype)
+
+    def load(start: int, buffer: NDArray[np.float64]) -> tuple[int, int]:
+        lower, upper = max(start - halo, 0), min(start + tile_rows + halo, n_rows)
+        np.copyto(buffer[: upper - lower], temp[lower:upper])
+        return lower, upper
+
+    starts = range(0, n_rows, tile_rows)
+    loaded, other, spare = buffers
+    lower, upper = load(starts[0], loaded)
+    for start in starts:
+        height = upper - lower
+        sub_source = None if source is None else source[lower:upper]
+        src, dst = loaded[:height], other[:height]
+        interior_rows = height - 2
+        sub_scratch = scratch[:interior_rows]
+        for _ in range(n_steps):
+            kernel(src, stencil, dst, sub_source, weight, sub_scratch)
+            src, dst = dst, src
+        result, free = (other, loaded) if n_steps % 2 else (loaded, other)
+
+        stop = min(start + tile_rows, n_rows)
+        if stop < n_rows:
+            next_lower, next_upper = load(stop, spare)
+
+        first, last = start - lower, stop - lower
+        np.copyto(temp[start:stop], result[first:last])
+
+        if stop < n_rows:
+            loaded, other, spare = spare, free, result
+            lower, upper = next_lower, next_upper
+
+
+def _cache_path() -> pathlib.Path:
+    if "HEAT_CACHE_DIR" in os.environ:
+        cache_dir = pathlib.Path(os.environ["HEAT_CACHE_DIR"])
+    else:
+        cache_dir = (
+            pathlib.Path(
+                os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache")
+            )
+            / "bmi-heat"
+        )
+    return cache_dir / "stencil-backends.json"
+
+
+def _read_cache(path: pathlib.Path) -> dict[str, str]:
+    try:
+        with open(path) as fp:
+            cache = json.load(fp)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_cache(path: pathlib.Path, cache: dict[str, str]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as fp:
+            json.dump(cache, fp, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def time_backend(
+    name: str,
+    temp: NDArray[np.float64],
+    out: NDArray[np.float64],
+    repeat: int = 3,
+) -> float:
+    """Time one step of a stencil backend.
+
+    Parameters
+    ----------
+    name : str
+        Name of the backend.
+    temp : ndarray
+        Input array with the shape and dtype to time.
+    out : ndarray
+        Output array.
+    repeat : int, optional
+        Number of timed steps.
+
+    Returns
+    -------
+    float
+        The fastest of *repeat* steps, in seconds.
+    """
+    kernel = get_backend(name)
+    stencil = np.zeros((3, 3), dtype=temp.dtype)
+
+    kernel(temp, stencil, out, None, 0.0, None)
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        kernel(temp, stencil, out, None, 0.0, None)
+        best = min(best, time.perf_counter() - start)
+    return float(best)
+
+
+def select_backend(
+    temp: NDArray[np.float64],
+    out: NDArray[np.float64],
+    cache: bool = True,
+) -> str:
+    """Choose the fastest stencil backend for an array.
+
+    Every available backend is timed on *temp* and *out*. The winner is
+    remembered, per shape and dtype, in a JSON file under
+    ``$HEAT_CACHE_DIR`` (or ``$XDG_CACHE_HOME/bmi-heat``) so that later
+    calls with the same shape and dtype skip the timing.
+
+    Parameters
+    ----------
+    temp : ndarray
+        Input array with the shape and dtype of the model grid.
+    out : ndarray
+        Output array, used as scratch space while timing.
+    cache : bool, optional
+        Read and write the on-disk cache.
+
+    Returns
+    -------
+    str
+        Name of the fastest backend.
+    """
+    key = "x".join(str(n) for n in temp.shape) + f":{temp.dtype}"
+    path = _cache_path()
+
+    if cache:
+        name = _read_cache(path).get(key)
+        if name in _BACKENDS:
+            return str(name)
+
+    timings = {name: time_backend(name, temp, out) for name in available_backends()}
+    best = min(timings, key=timings.__getitem__)
+
+    if cache:
+        cached = _read_cache(path)
+        cached[key] = best
+        _write_cache(path, cached)
+
+    return best
@@ -0,0 +1,242 @@
+"""Track which tiles of a field have changed."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class TileLayout:
+    """Split a 2D grid into fixed-size tiles.
+
+    Tiles are numbered in row-major order. Tiles along the last row and
+    column of tiles are smaller if the tile shape does not evenly divide
+    the grid.
+
+    Examples
+    --------
+    >>> from heat.tiles import TileLayout
+    >>> layout = TileLayout((5, 7), (2, 3))
+    >>> layout.n_tiles
+    9
+    >>> layout.slices(8)
+    (slice(4, 5, None), slice(6, 7, None))
+    >>> layout.tile_size([0, 8])
+    array([6, 1])
+    """
+
+    def __init__(self, shape: Sequence[int], tile_shape: Sequence[int]) -> None:
+        """Create a tile layout.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the grid.
+        tile_shape : tuple of int
+            Number of rows and columns in a tile.
+        """
+        if len(shape) != 2 or len(tile_shape) != 2 or min(tile_shape) < 1:
+            raise ValueError(f"{tile_shape}: tile shape must be two positive ints")
+        self._shape = (int(shape[0]), int(shape[1]))
+        self._tile_shape = (int(tile_shape[0]), int(tile_shape[1]))
+
+        self._row_starts = np.arange(0, self._shape[0], self._tile_shape[0])
+        self._col_starts = np.arange(0, self._shape[1], self._tile_shape[1])
+        self._row_sizes = np.diff(self._row_starts, append=self._shape[0])
+        self._col_sizes = np.diff(self._col_starts, append=self._shape[1])
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """Shape of the grid."""
+        return self._shape
+
+    @property
+    def tile_shape(self) -> tuple[int, int]:
+        """Shape of a (full) tile."""
+        return self._tile_shape
+
+    @property
+    def n_tiles(self) -> int:
+        """Number of tiles."""
+        return len(self._row_starts) * len(self._col_starts)
+
+    def slices(self, tile: int) -> tuple[slice, slice]:
+        """Row and column slices of a tile.
+
+        Parameters
+        ----------
+        tile : int
+            Tile id.
+
+        Returns
+        -------
+        tuple of slice
+            Slices that select the tile from the grid.
+        """
+        row, col = divmod(int(tile), len(self._col_starts))
+        row_start, col_start = int(self._row_starts[row]), int(self._col_starts[col])
+        return (
+            slice(row_start, row_start + int(self._row_sizes[row])),
+            slice(col_start, col_start + int(self._col_sizes[col])),
+        )
+
+    def tile_size(self, tiles: NDArray[np.int_] | Sequence[int]) -> NDArray[np.int_]:
+        """Number of cells in each of a set of tiles."""
+        rows, cols = np.divmod(np.asarray(tiles), len(self._col_starts))
+        return self._row_sizes[rows] * self._col_sizes[cols]
+
+    def tile_max(self, values: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Maximum value within each tile, as a flat array of tile values."""
+        by_row = np.maximum.reduceat(values, self._row_starts, axis=0)
+        return np.maximum.reduceat(by_row, self._col_starts, axis=1).reshape(-1)
+
+    def pack(
+        self,
+        values: NDArray[np.float64],
+        tiles: NDArray[np.int_] | Sequence[int],
+        out: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Copy tiles, one after another, into a flat buffer.
+
+        Parameters
+        ----------
+        values : ndarray
+            Values on the grid.
+        tiles : array_like of int
+            Ids of the tiles to copy.
+        out : ndarray
+            Flat buffer that is large enough to hold the tiles.
+
+        Returns
+        -------
+        ndarray
+            View of *out* that holds the packed tiles.
+        """
+        start = 0
+        for tile in tiles:
+            rows, cols = self.slices(tile)
+            block = values[rows, cols]
+            end = start + block.size
+            np.copyto(out[start:end].reshape(block.shape), block)
+            start = end
+        return out[:start]
+
+    def unpack(
+        self,
+        packed: NDArray[np.float64],
+        tiles: NDArray[np.int_] | Sequence[int],
+        values: NDArray[np.float64],
+    ) -> None:
+        """Copy packed tiles into the grid; the inverse of :meth:`pack`."""
+        packed = np.asarray(packed).reshape(-1)
+        start = 0
+        for tile in tiles:
+            rows, cols = self.slices(tile)
+            block = values[rows, cols]
+            end = start + block.size
+            block[...] = packed[start:end].reshape(block.shape)
+            start = end
+        if start != packed.size:
+            raise ValueError(
+                f"size mismatch between packed values ({packed.size}) and tiles"
+                f" ({start})"
+            )
+
+
+class ChangeTracker:
+    """Find the tiles of a field that changed since they were last read.
+
+    A tile has changed if any of its values differs by more than a
+    threshold from the value when the tile was last read. Tiles that are
+    not read keep their old reference values, so small changes that
+    accumulate are eventually reported.
+
+    Examples
+    --------
+    >>> from heat.tiles import ChangeTracker
+    >>> z = np.zeros((4, 4))
+    >>> tracker = ChangeTracker(z.shape, (2, 2), threshold=0.1)
+    >>> tiles, packed = tracker.read(z, np.empty(16))
+    >>> tiles
+    array([0, 1, 2, 3])
+    >>> z[3, 3] = 1.0
+    >>> z[0, 0] = 0.05
+    >>> tiles, packed = tracker.read(z, np.empty(16))
+    >>> tiles, packed
+    (array([3]), array([0., 0., 0., 1.]))
+    >>> tracker.changed(z)
+    array([], dtype=int64)
+    """
+
+    def __init__(
+        self,
+        shape: Sequence[int],
+        tile_shape: Sequence[int],
+        threshold: float = 0.0,
+    ) -> None:
+        """Start tracking changes.
+
+        Parameters
+        ----------
+        shape : tuple of int
+            Shape of the field.
+        tile_shape : tuple of int
+            Number of rows and columns in a tile.
+        threshold : float, optional
+            Tiles whose values change by no more than this are unchanged.
+        """
+        self._layout = TileLayout(shape, tile_shape)
+        self._threshold = threshold
+        self._reference = np.empty(self._layout.shape)
+        self._scratch = np.empty(self._layout.shape)
+        self._unread = True
+
+    @property
+    def layout(self) -> TileLayout:
+        """Layout of the tiles."""
+        return self._layout
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes held by the reference and scratch arrays."""
+        return self._reference.nbytes + self._scratch.nbytes
+
+    def reset(self) -> None:
+        """Forget what has been read; every tile is reported as changed."""
+        self._unread = True
+
+    def changed(self, values: NDArray[np.float64]) -> NDArray[np.int_]:
+        """Ids of the tiles that changed since they were last read."""
+        if self._unread:
+            return np.arange(self._layout.n_tiles)
+        np.subtract(values, self._reference, out=self._scratch)
+        np.abs(self._scratch, out=self._scratch)
+        return np.flatnonzero(self._layout.tile_max(self._scratch) > self._threshold)
+
+    def read(
+        self, values: NDArray[np.float64], out: NDArray[np.float64]
+    ) -> tuple[NDArray[np.int_], NDArray[np.float64]]:
+        """Pack the changed tiles and mark them as read.
+
+        Parameters
+        ----------
+        values : ndarray
+            Current values of the field.
+        out : ndarray
+            Flat buffer large enough to hold the changed tiles.
+
+        Returns
+        -------
+        tuple of ndarray
+            Ids of the changed tiles and a view of *out* that holds
+            their values.
+        """
+        tiles = self.changed(values)
+        packed = self._layout.pack(values, tiles, out)
+        if self._unread:
+            np.copyto(self._reference, values)
+            self._unread = False
+        else:
+            self._layout.unpack(packed, tiles, self._reference)
+        return tiles, packed
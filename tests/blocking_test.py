@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+from heat import Heat
+from heat.stencil import available_backends
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("block_steps,tile_rows", [(2, 3), (3, 1), (4, 7), (5, None)])
+def test_blocked_matches_step_by_step(backend, block_steps, tile_rows):
+    stepped = Heat(shape=(23, 9), spacing=(1.0, 2.0), backend=backend)
+    blocked = Heat(
+        shape=(23, 9),
+        spacing=(1.0, 2.0),
+        backend=backend,
+        block_steps=block_steps,
+        tile_rows=tile_rows,
+    )
+    blocked.temperature = stepped.temperature
+    source = np.random.random((23, 9))
+    stepped.source, blocked.source = source, source
+
+    for _ in range(11):
+        stepped.advance_in_time()
+    blocked.advance_in_time(11)
+
+    assert_array_equal(blocked.temperature, stepped.temperature)
+    assert blocked.time == stepped.time
+
+
+def test_blocked_low_memory():
+    stepped = Heat(shape=(16, 12), low_memory=True)
+    blocked = Heat(shape=(16, 12), low_memory=True, block_steps=3, tile_rows=4)
+    blocked.temperature = stepped.temperature
+
+    for _ in range(7):
+        stepped.advance_in_time()
+    blocked.advance_in_time(7)
+
+    assert_array_equal(blocked.temperature, stepped.temperature)
+
+
+def test_blocking_skipped_with_probes():
+    heat = Heat(shape=(10, 10), block_steps=4)
+    recorder = heat.add_probes([44], capacity=10)
+
+    heat.advance_in_time(6)
+    assert recorder.count == 6
+
+
+def test_bmi_update_until_with_blocking():
+    stepped, blocked = BmiHeat(), BmiHeat()
+    stepped.initialize(StringIO(yaml.dump({"shape": [12, 10]})))
+    blocked.initialize(StringIO(yaml.dump({"shape": [12, 10], "block_steps": 4})))
+    blocked.set_value(
+        "plate_surface__temperature",
+        stepped.get_value_ptr("plate_surface__temperature"),
+    )
+
+    stepped.update_until(5.3)
+    blocked.update_until(5.3)
+
+    assert blocked.get_current_time() == stepped.get_current_time()
+    assert_array_equal(
+        blocked.get_value_ptr("plate_surface__temperature"),
+        stepped.get_value_ptr("plate_surface__temperature"),
+    )
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+import json
+
+import numpy as np
+import pytest
+import yaml
+
+from heat.cli import main
+from heat.cli import run
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("HEAT_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "heat.yaml"
+    path.write_text(yaml.dump({"shape": [6, 8]}))
+    return str(path)
+
+
+def test_run(config_file):
+    stats = run(config_file, 10.1)
+
+    assert stats["shape"] == [6, 8]
+    assert stats["end_time"] == pytest.approx(10.1)
+    assert stats["n_steps"] == 41
+    assert stats["n_outputs"] == 0
+    assert stats["cell_updates_per_second"] == pytest.approx(
+        48 * stats["steps_per_second"]
+    )
+
+
+def test_run_with_output(config_file, tmp_path):
+    stats = run(config_file, 2.0, output_interval=0.75, output_dir=tmp_path / "out")
+
+    assert stats["n_outputs"] == 3
+    assert stats["n_steps"] == 8
+    outputs = sorted((tmp_path / "out").iterdir())
+    assert [path.name for path in outputs] == [
+        "temperature-000000.npy",
+        "temperature-000001.npy",
+        "temperature-000002.npy",
+    ]
+    assert np.load(outputs[0]).shape == (48,)
+
+
+def test_main_json(config_file, capsys):
+    assert main([config_file, "--end-time", "1.0", "--json"]) == 0
+
+    stats = json.loads(capsys.readouterr().out)
+    assert stats["n_steps"] == 4
+    assert stats["backend"] in ("ndimage", "numpy", "numba")
+
+
+def test_main_text(config_file, capsys):
+    assert main([config_file, "--end-time", "1.0"]) == 0
+
+    out = capsys.readouterr().out
+    assert "steps_per_second: " in out
+    assert "peak_rss: " in out
+
+
+def test_main_bad_interval(config_file):
+    with pytest.raises(SystemExit):
+        main([config_file, "--end-time", "1.0", "--output-interval", "0"])
+
+
+def test_n_steps_counts_fractional_steps(tmp_path):
+    config = tmp_path / "heat.yaml"
+    config.write_text(yaml.dump({"shape": [6, 8], "backend": "numpy"}))
+
+    stats = run(str(config), end_time=1.1, output_interval=0.3)
+
+    assert stats["end_time"] == pytest.approx(1.1)
+    assert stats["n_steps"] == 2 + 2 + 2 + 1
+    assert stats["backend"] == "numpy"
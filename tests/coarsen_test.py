@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+
+
+def _initialize(**kwds):
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump(kwds)))
+    return model
+
+
+def test_coarsened_var_names():
+    model = _initialize(shape=[16, 12], coarsening_factors=[4, 2])
+
+    assert model.get_output_var_names() == (
+        "plate_surface__temperature",
+        "plate_surface__block_average_of_temperature_2x2",
+        "plate_surface__block_average_of_temperature_4x4",
+    )
+    assert model.get_var_grid("plate_surface__block_average_of_temperature_2x2") == 1
+    assert model.get_var_grid("plate_surface__block_average_of_temperature_4x4") == 2
+
+
+def test_coarsened_grids():
+    model = _initialize(
+        shape=[17, 12],
+        spacing=[1.0, 2.0],
+        origin=[10.0, 20.0],
+        coarsening_factors=[4],
+    )
+
+    assert model.get_grid_type(1) == "uniform_rectilinear"
+    assert model.get_grid_rank(1) == 2
+    assert model.get_grid_size(1) == 12
+    assert_array_equal(model.get_grid_shape(1, np.empty(2, dtype=int)), (4, 3))
+    assert_array_equal(model.get_grid_spacing(1, np.empty(2)), (4.0, 8.0))
+    assert_array_equal(model.get_grid_origin(1, np.empty(2)), (11.5, 23.0))
+
+    assert_array_equal(model.get_grid_shape(0, np.empty(2, dtype=int)), (17, 12))
+    assert_array_equal(model.get_grid_spacing(0, np.empty(2)), (1.0, 2.0))
+
+
+def test_coarsened_values():
+    model = _initialize(shape=[8, 8], coarsening_factors=[2, 4])
+    z = model.get_value_ptr("plate_surface__temperature")
+
+    dest = np.empty(4)
+    model.get_value("plate_surface__block_average_of_temperature_4x4", dest)
+    assert_array_almost_equal(dest, z.reshape((2, 4, 2, 4)).mean(axis=(1, 3)).flat)
+
+    model.update()
+    level = model.get_value_ptr("plate_surface__block_average_of_temperature_2x2")
+    assert_array_almost_equal(level, z.reshape((4, 2, 4, 2)).mean(axis=(1, 3)))
+
+    model.get_value("plate_surface__block_average_of_temperature_4x4", dest)
+    assert_array_almost_equal(dest, z.reshape((2, 4, 2, 4)).mean(axis=(1, 3)).flat)
+
+
+def test_coarsened_values_follow_setters():
+    model = _initialize(shape=[4, 4], coarsening_factors=[2])
+    name = "plate_surface__block_average_of_temperature_2x2"
+
+    model.set_value("plate_surface__temperature", np.zeros(16))
+    assert_array_equal(model.get_value_ptr(name), 0.0)
+
+    model.set_value_at_indices("plate_surface__temperature", [0, 1, 4, 5], [4.0] * 4)
+    assert_array_equal(model.get_value_ptr(name), [[4.0, 0.0], [0.0, 0.0]])
+
+
+@pytest.mark.parametrize("factor", (1, 9))
+def test_bad_coarsening_factor(factor):
+    with pytest.raises(ValueError):
+        _initialize(shape=[8, 8], coarsening_factors=[factor])
+
+
+def test_coarsened_metadata_does_not_compute():
+    model = _initialize(shape=[8, 8], coarsening_factors=[2])
+    name = "plate_surface__block_average_of_temperature_2x2"
+
+    assert model.get_var_type(name) == "float64"
+    assert model.get_var_nbytes(name) == 16 * 8
+    assert model.get_var_itemsize(name) == 8
+    assert not model._pyramid._fresh
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+import os
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+from heat import Heat
+from heat import solve_2d
+
+
+def _reference_step(temp, alpha, time_step):
+    """Variable-coefficient step, cell by cell, for unit spacing."""
+    out = temp.copy()
+    n_rows, n_cols = temp.shape
+    for row in range(1, n_rows - 1):
+        for col in range(1, n_cols - 1):
+            flux = 0.0
+            for other in (
+                (row - 1, col),
+                (row + 1, col),
+                (row, col - 1),
+                (row, col + 1),
+            ):
+                a, b = alpha[row, col], alpha[other]
+                face = 2.0 * a * b / (a + b) if a + b > 0.0 else 0.0
+                flux += 0.5 * face * (temp[other] - temp[row, col])
+            out[row, col] += time_step * flux
+    return out
+
+
+def test_matches_reference():
+    temp = np.random.random((6, 7))
+    alpha = np.random.uniform(0.1, 1.0, (6, 7))
+    alpha[2, 3] = 0.0
+
+    actual = solve_2d(temp, (1.0, 1.0), alpha=alpha, time_step=0.2)
+    assert_array_almost_equal(actual, _reference_step(temp, alpha, 0.2))
+
+
+@pytest.mark.parametrize("spacing", [(1.0, 1.0), (1.0, 2.0), (3.0, 0.5)])
+def test_uniform_field_matches_scalar(spacing):
+    temp = np.random.random((6, 7))
+    source = np.random.random((6, 7))
+
+    expected = solve_2d(temp, spacing, alpha=0.3, time_step=0.5, source=source)
+    actual = solve_2d(
+        temp, spacing, alpha=np.full((6, 7), 0.3), time_step=0.5, source=source
+    )
+    assert_array_almost_equal(actual, expected)
+
+
+def test_in_place_matches_out_of_place():
+    temp = np.random.random((6, 7))
+    alpha = np.random.uniform(0.1, 1.0, (6, 7))
+
+    expected = solve_2d(temp, (1.0, 2.0), alpha=alpha, time_step=0.2)
+    actual = solve_2d(temp, (1.0, 2.0), out=temp, alpha=alpha, time_step=0.2)
+    assert actual is temp
+    assert_array_equal(actual, expected)
+
+
+def test_time_step_from_largest_diffusivity():
+    alpha = np.full((5, 6), 0.5)
+    alpha[2, 2] = 2.0
+    heat = Heat(shape=(5, 6), alpha=alpha)
+    assert heat.time_step == pytest.approx(1.0 / 8.0)
+
+    heat.diffusivity = 1.0
+    assert heat.time_step == pytest.approx(0.25)
+
+
+def test_conductances_are_kept_until_diffusivity_changes():
+    alpha = np.random.uniform(0.1, 1.0, (5, 6))
+    heat = Heat(shape=(5, 6), alpha=alpha)
+
+    conductances = heat._conductances
+    heat.advance_in_time(3)
+    assert heat._conductances is conductances
+
+    heat.diffusivity = alpha[::-1]
+    assert heat._conductances is not conductances
+
+
+def test_uniform_field_uses_stencil_backend():
+    heat = Heat(shape=(5, 6), alpha=np.full((5, 6), 0.5))
+    assert heat._conductances is None
+    assert heat.time_step == pytest.approx(0.5)
+
+
+def test_advance_matches_solve_2d():
+    alpha = np.random.uniform(0.1, 1.0, (5, 6))
+    heat = Heat(shape=(5, 6), alpha=alpha)
+    heat.source[2, 3] = 1.0
+
+    expected = heat.temperature.copy()
+    for _ in range(3):
+        expected = solve_2d(
+            expected,
+            heat.spacing,
+            alpha=alpha,
+            time_step=heat.time_step,
+            source=heat.source,
+        )
+    heat.advance_in_time(3)
+
+    assert_array_almost_equal(heat.temperature, expected)
+
+
+def test_low_memory():
+    alpha = np.random.uniform(0.1, 1.0, (5, 6))
+    heat = Heat(shape=(5, 6), alpha=alpha)
+    low_memory = Heat(shape=(5, 6), alpha=alpha, low_memory=True)
+    low_memory.temperature = heat.temperature
+
+    heat.advance_in_time(4)
+    low_memory.advance_in_time(4)
+
+    assert_array_equal(low_memory.temperature, heat.temperature)
+
+
+def test_bad_diffusivity():
+    with pytest.raises(ValueError):
+        Heat(shape=(5, 6), alpha=np.ones((6, 5)))
+    with pytest.raises(ValueError):
+        Heat(shape=(5, 6), alpha=np.full((5, 6), -1.0))
+
+
+def test_diffusivity_from_file(tmp_path):
+    alpha = np.random.uniform(0.1, 2.0, (5, 6))
+    np.save(tmp_path / "alpha.npy", alpha)
+    with open(tmp_path / "heat.yaml", "w") as fp:
+        yaml.dump({"shape": [5, 6], "alpha": "alpha.npy"}, fp)
+
+    model = BmiHeat()
+    model.initialize(os.path.join(tmp_path, "heat.yaml"))
+
+    assert_array_equal(
+        model.get_value("plate_surface__thermal_diffusivity", np.empty(30)),
+        alpha.reshape(-1),
+    )
+    assert model.get_time_step() == pytest.approx(0.25 / alpha.max())
+
+
+def test_bmi_set_diffusivity():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [5, 6]})))
+
+    assert model.get_var_units("plate_surface__thermal_diffusivity") == "m2 s-1"
+    assert model.get_var_grid("plate_surface__thermal_diffusivity") == 0
+    assert model.get_time_step() == pytest.approx(0.25)
+
+    alpha = np.ones(30)
+    alpha[:15] = 4.0
+    model.set_value("plate_surface__thermal_diffusivity", alpha)
+    assert model.get_time_step() == pytest.approx(1.0 / 16.0)
+    assert model._model._conductances is not None
+
+    model.set_value_at_indices(
+        "plate_surface__thermal_diffusivity", np.arange(15), np.ones(15)
+    )
+    assert model.get_time_step() == pytest.approx(0.25)
+    assert model._model._conductances is None
+
+
+def test_reset_restores_diffusivity():
+    alpha = np.random.uniform(0.1, 1.0, (5, 6))
+    heat = Heat(shape=(5, 6), alpha=alpha)
+
+    heat.diffusivity = 4.0
+    heat.reset()
+
+    assert_array_equal(heat.diffusivity, alpha)
+    assert heat.time_step == pytest.approx(0.25 / alpha.max())
+    assert heat._conductances is not None
+
+
+def test_reset_keeps_unchanged_conductances():
+    alpha = np.random.uniform(0.1, 1.0, (5, 6))
+    heat = Heat(shape=(5, 6), alpha=alpha)
+    conductances = heat._conductances
+
+    heat.time_step = 0.01
+    heat.reset()
+
+    assert heat._conductances is conductances
+    assert heat.time_step == pytest.approx(0.25 / alpha.max())
+
+
+def test_bmi_diffusivity_metadata_does_not_allocate():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [5, 6]})))
+    name = "plate_surface__thermal_diffusivity"
+
+    assert model.get_var_type(name) == "float64"
+    assert model.get_var_nbytes(name) == 30 * 8
+    assert model._model._diffusivity is None
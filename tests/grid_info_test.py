@@ -13,7 +13,11 @@ def test_grid_var_names():
     model.initialize()
 
     names = model.get_input_var_names()
-    assert names == ("plate_surface__temperature",)
+    assert names == (
+        "plate_surface__temperature",
+        "plate_surface__heat_source_rate",
+        "plate_surface__thermal_diffusivity",
+    )
 
     names = model.get_output_var_names()
     assert names == ("plate_surface__temperature",)
@@ -24,7 +28,7 @@ def test_grid_var_item_count():
     model.initialize()
 
     count = model.get_input_item_count()
-    assert count == 1
+    assert count == 3
 
     count = model.get_output_item_count()
     assert count == 1
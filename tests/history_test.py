@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+from heat import Heat
+from heat.history import FieldHistory
+
+
+def _smooth_run(n_steps, **kwds):
+    heat = Heat(shape=(64, 48))
+    rows, cols = np.meshgrid(
+        np.linspace(0, 3, 64), np.linspace(0, 2, 48), indexing="ij"
+    )
+    heat.temperature = np.sin(rows) * np.cos(cols)
+
+    history = FieldHistory(heat.shape, **kwds)
+    snapshots = []
+    for _ in range(n_steps):
+        heat.advance_in_time()
+        history.append(heat.time, heat.temperature)
+        snapshots.append(heat.temperature.copy())
+    return history, snapshots
+
+
+@pytest.mark.parametrize("keyframe_interval", (1, 4, 32))
+def test_lossless_random_access(keyframe_interval):
+    history, snapshots = _smooth_run(20, keyframe_interval=keyframe_interval)
+
+    out = np.empty(64 * 48)
+    for index in (7, 19, 0, 3, 4, 18, -1):
+        assert_array_equal(history.get(index, out).reshape((64, 48)), snapshots[index])
+
+
+def test_error_bounded():
+    history, snapshots = _smooth_run(40, error_bound=1e-5)
+
+    out = np.empty((64, 48))
+    for index in (39, 0, 21):
+        history.get(index, out)
+        assert np.abs(out - snapshots[index]).max() <= 1e-5
+
+    assert history.raw_nbytes >= 10 * history.nbytes
+
+
+@pytest.mark.parametrize("value", [1e14, np.inf, np.nan])
+def test_error_bounded_rejects_unrepresentable_values(value):
+    history = FieldHistory((2, 3), error_bound=1e-6)
+    history.append(0.0, np.zeros((2, 3)))
+
+    field = np.zeros((2, 3))
+    field[1, 2] = value
+    with pytest.raises(ValueError):
+        history.append(1.0, field)
+    assert len(history) == 1
+
+    history.append(1.0, np.ones((2, 3)))
+    np.testing.assert_allclose(history.get(1, np.empty((2, 3))), 1.0, atol=1e-6)
+
+
+def test_get_at_time():
+    history, snapshots = _smooth_run(5)
+
+    out = np.empty((64, 48))
+    assert_array_equal(history.get_at_time(3 * 0.25, out), snapshots[2])
+    with pytest.raises(KeyError):
+        history.get_at_time(0.3, out)
+
+
+def test_bmi_history():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"history": {"keyframe_interval": 3}})))
+    z = model.get_value_ptr("plate_surface__temperature")
+    initial = z.copy()
+
+    model.update_until(2.0)
+
+    history = model.get_history()
+    assert len(history) == 9
+    assert history.times[-1] == 2.0
+
+    out = np.empty(200)
+    assert_array_equal(history.get(0, out), initial.flat)
+    assert_array_equal(history.get_at_time(2.0, out), z.flat)
+
+
+@pytest.mark.parametrize("error_bound", (None, 1e-5))
+@pytest.mark.parametrize("keep", (0, 4, 6))
+def test_truncate_then_append(keep, error_bound):
+    history, snapshots = _smooth_run(10, keyframe_interval=4, error_bound=error_bound)
+    times = history.times
+
+    history.truncate(times[keep - 1] if keep > 0 else 0.0)
+    assert history.times == times[:keep]
+
+    new = snapshots[0][::-1].copy()
+    history.append(times[keep], new)
+    history.append(times[keep + 1], snapshots[keep])
+
+    out = np.empty((64, 48))
+    atol = error_bound or 0.0
+    for index in range(keep):
+        np.testing.assert_allclose(history.get(index, out), snapshots[index], atol=atol)
+    np.testing.assert_allclose(history.get(keep, out), new, atol=atol)
+    np.testing.assert_allclose(history.get(keep + 1, out), snapshots[keep], atol=atol)
+
+
+def test_bmi_history_after_rollback():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"history": True})))
+    z = model.get_value_ptr("plate_surface__temperature")
+
+    model.save_state("a")
+    model.update_until(1.0)
+    model.restore_state("a")
+    model.update_until(0.5)
+    model.update_until(1.0)
+
+    history = model.get_history()
+    assert history.times == (0.0, 0.25, 0.5, 0.75, 1.0)
+    assert_array_equal(history.get_at_time(1.0, np.empty(200)), z.flat)
+
+
+def test_bmi_history_not_enabled():
+    model = BmiHeat()
+    model.initialize()
+    with pytest.raises(RuntimeError):
+        model.get_history()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+from heat import Heat
+from heat import solve_2d
+
+
+def test_solve_2d_in_place_matches_two_buffers():
+    temp = np.random.random((9, 12))
+    source = np.random.random((9, 12))
+    kwds = {"alpha": 0.3, "time_step": 0.4, "source": source}
+
+    expected = solve_2d(temp, (1.0, 2.0), backend="numpy", **kwds)
+    actual = solve_2d(temp, (1.0, 2.0), out=temp, **kwds)
+
+    assert actual is temp
+    assert_array_equal(actual, expected)
+
+
+def test_low_memory_heat_matches_two_buffers():
+    low = Heat(shape=(8, 11), low_memory=True)
+    high = Heat(shape=(8, 11), backend="numpy")
+    low.temperature = high.temperature
+    low.set_point_sources([20], [3.0])
+    high.set_point_sources([20], [3.0])
+
+    for _ in range(10):
+        low.advance_in_time()
+        high.advance_in_time()
+
+    assert low.low_memory and not high.low_memory
+    assert_array_equal(low.temperature, high.temperature)
+    assert low.time == high.time
+
+
+def test_low_memory_footprint():
+    low = Heat(shape=(100, 50), low_memory=True)
+    high = Heat(shape=(100, 50))
+
+    assert low.nbytes == 100 * 50 * 8
+    assert high.nbytes == 2 * low.nbytes
+
+
+def test_bmi_model_nbytes():
+    model = BmiHeat()
+    model.initialize(
+        StringIO(
+            yaml.dump({"shape": [8, 8], "low_memory": True, "coarsening_factors": [2]})
+        )
+    )
+    assert model.get_model_nbytes() == 8 * 8 * 8 + 4 * 4 * 8
+
+    model.get_value_ptr("plate_surface__heat_source_rate")
+    recorder = model.add_probes([9, 10], capacity=5)
+    assert model.get_model_nbytes() == 2 * 8 * 8 * 8 + 4 * 4 * 8 + recorder.nbytes
+
+
+@pytest.mark.parametrize("backend", ["ndimage", "bogus"])
+def test_low_memory_rejects_other_backends(backend):
+    with pytest.raises(ValueError):
+        Heat(shape=(8, 8), low_memory=True, backend=backend)
+
+
+@pytest.mark.parametrize("backend", [None, "numpy", "auto"])
+def test_low_memory_backends(backend):
+    assert Heat(shape=(8, 8), low_memory=True, backend=backend).backend == "numpy"
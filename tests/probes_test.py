@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+from heat.probes import ProbeRecorder
+
+
+def test_probes_record_every_step():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [5, 6]})))
+    recorder = model.add_probes([7, 8, 22], capacity=100)
+
+    z = model.get_value_ptr("plate_surface__temperature")
+    expected = []
+    for _ in range(4):
+        model.update()
+        expected.append(z.take([7, 8, 22]))
+
+    assert recorder.count == 4
+    assert_array_almost_equal(recorder.times, np.arange(1, 5) * model.get_time_step())
+    assert_array_equal(recorder.values, expected)
+
+
+def test_probes_within_update_until():
+    model = BmiHeat()
+    model.initialize()
+    recorder = model.add_probes([21], capacity=8)
+
+    model.update_until(10.1)
+
+    assert recorder.count == 41
+    assert recorder.values.shape == (8, 1)
+    assert recorder.times[-1] == pytest.approx(10.1)
+    assert np.all(np.diff(recorder.times) > 0.0)
+
+
+def test_probe_history_is_a_view():
+    recorder = ProbeRecorder([0, 1], capacity=3)
+    for time in range(5):
+        recorder.record(float(time), np.full(4, float(time)))
+
+    values = recorder.values
+    assert values.base is not None
+    assert values.flags.c_contiguous
+    assert_array_equal(recorder.times, [2.0, 3.0, 4.0])
+    assert_array_equal(values, [[2.0, 2.0], [3.0, 3.0], [4.0, 4.0]])
+
+
+def test_probes_are_removed_on_reset():
+    model = BmiHeat()
+    model.initialize()
+    recorder = model.add_probes([21], capacity=8)
+    model.update()
+
+    model.reset()
+    assert recorder.count == 0
+    assert recorder.values.shape == (0, 1)
+
+    model.update()
+    assert recorder.count == 0
+
+
+@pytest.mark.parametrize("index", [30, 1000, -1])
+def test_bad_probe_index(index):
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [5, 6]})))
+
+    with pytest.raises(ValueError):
+        model.add_probes([0, index], capacity=4)
+
+    model.update()
+    assert model.get_current_time() == model.get_time_step()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_less
+
+from heat import BmiHeat
+from heat import BmiHeatPool
+from heat import Heat
+from heat.heat import load_config
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "heat.yaml"
+    path.write_text(yaml.dump({"shape": [6, 5], "statistics": True}))
+    return str(path)
+
+
+def test_load_config_is_cached(config_file):
+    config = load_config(config_file)
+    assert config == {"shape": [6, 5], "statistics": True}
+
+    config["shape"][0] = 100
+    assert load_config(config_file)["shape"] == [6, 5]
+
+
+def test_load_config_reloads_modified_file(config_file):
+    load_config(config_file)
+
+    with open(config_file, "w") as fp:
+        fp.write(yaml.dump({"shape": [3, 3]}))
+    stat = os.stat(config_file)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_config(config_file) == {"shape": [3, 3]}
+
+
+def test_reset_reuses_arrays(config_file):
+    model = BmiHeat()
+    model.initialize(config_file)
+    z = model.get_value_ptr("plate_surface__temperature")
+    mean = model.get_value_ptr("plate_surface__time_average_of_temperature")
+
+    model.set_value("plate_surface__heat_source_rate", np.ones(30))
+    model.update_until(2.0)
+    model.reset(config_file)
+
+    assert model.get_current_time() == 0.0
+    assert model.get_value_ptr("plate_surface__temperature") is z
+    assert model.get_value_ptr("plate_surface__time_average_of_temperature") is mean
+    assert np.all(model.get_value_ptr("plate_surface__heat_source_rate") == 0.0)
+    assert_array_less(z, 1.0)
+    assert_array_less(0.0, z)
+    assert np.all(mean == z)
+
+
+def test_reset_does_not_allocate_temperature():
+    heat = Heat(shape=(200, 100))
+    heat.advance_in_time()
+
+    tracemalloc.start()
+    heat.reset()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < heat.temperature.nbytes // 4
+    assert heat.time == 0.0
+
+
+def test_seeded_reset_is_reproducible():
+    fields = []
+    for _ in range(2):
+        np.random.seed(1945)
+        heat = Heat(shape=(6, 5))
+        heat.reset()
+        first = heat.temperature.copy()
+        heat.reset()
+        fields.append((first, heat.temperature.copy()))
+
+    np.testing.assert_array_equal(fields[0][0], fields[1][0])
+    np.testing.assert_array_equal(fields[0][1], fields[1][1])
+    assert not np.array_equal(fields[0][0], fields[0][1])
+
+
+def test_reset_with_new_config(config_file):
+    model = BmiHeat()
+    model.initialize(config_file)
+    model.reset()
+
+    assert model.get_grid_size(0) == 200
+    assert model.get_output_item_count() == 1
+
+
+def test_pool_reuses_models(config_file):
+    pool = BmiHeatPool()
+
+    with pool.model(config_file) as model:
+        model.update()
+    assert len(pool) == 1
+
+    with pool.model() as other:
+        assert other is not model
+    assert len(pool) == 2
+
+    with pool.model(config_file) as again:
+        assert again is model
+        assert again.get_current_time() == 0.0
+    assert len(pool) == 2
+
+    pool.clear()
+    assert len(pool) == 0
+
+
+def test_pool_model_has_no_earlier_probes_or_consumers(config_file):
+    pool = BmiHeatPool()
+
+    with pool.model(config_file) as model:
+        recorder = model.add_probes([3, 4], capacity=8)
+        model.add_tile_consumer("coupler", tile_shape=(2, 2))
+        model.update()
+
+    with pool.model(config_file) as again:
+        assert again is model
+        assert again._model._probes == []
+        assert again._tile_consumers == {}
+        again.update_until(10.0)
+    assert recorder.count == 0
+
+
+def test_pool_max_idle():
+    pool = BmiHeatPool(max_idle=1)
+
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    assert len(pool) == 1
+    assert pool.acquire() is first
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+from heat.snapshots import SnapshotRing
+
+
+def test_restore_rewinds_model():
+    model = BmiHeat()
+    model.initialize()
+    z = model.get_value_ptr("plate_surface__temperature")
+
+    model.update_until(1.0)
+    model.save_state("analysis")
+    expected = z.copy()
+
+    model.update_until(5.0)
+    model.restore_state("analysis")
+
+    assert model.get_value_ptr("plate_surface__temperature") is z
+    assert_array_equal(z, expected)
+    assert model.get_current_time() == 1.0
+    assert model.get_time_step() == 0.25
+
+
+def test_replay_after_restore_is_identical():
+    model = BmiHeat()
+    model.initialize()
+    z = model.get_value_ptr("plate_surface__temperature")
+
+    model.save_state("start")
+    model.update_until(2.0)
+    first = z.copy()
+
+    model.restore_state("start")
+    model.update_until(2.0)
+    assert_array_equal(z, first)
+
+
+def test_least_recently_used_is_evicted():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"max_snapshots": 2})))
+
+    model.save_state("a")
+    model.update()
+    model.save_state("b")
+    model.restore_state("a")
+    model.save_state("c")
+
+    model.restore_state("a")
+    model.restore_state("c")
+    with pytest.raises(KeyError):
+        model.restore_state("b")
+
+
+def test_unknown_snapshot():
+    model = BmiHeat()
+    model.initialize()
+    with pytest.raises(KeyError):
+        model.restore_state("missing")
+
+
+def test_discarded_slots_are_reused():
+    ring = SnapshotRing((3,), capacity=2)
+    ring.save("a", np.zeros(3), 0.0, 1.0)
+    ring.save("b", np.ones(3), 1.0, 1.0)
+    ring.discard("a")
+    ring.save("c", np.full(3, 2.0), 2.0, 1.0)
+
+    out = np.empty(3)
+    assert ring.restore("b", out) == (1.0, 1.0)
+    assert_array_equal(out, 1.0)
+    assert ring.names == ("c", "b")
+
+
+def test_restore_restarts_statistics():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [5, 6], "statistics": True})))
+    z = model.get_value_ptr("plate_surface__temperature")
+
+    model.save_state("a")
+    expected = z.copy()
+    model.update_until(2.0)
+    model.restore_state("a")
+
+    assert model._statistics.count == 1
+    mean = model.get_value_ptr("plate_surface__time_average_of_temperature")
+    assert_array_equal(mean, expected)
+    assert_array_equal(
+        model.get_value_ptr("plate_surface__time_variance_of_temperature"), 0.0
+    )
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+import tracemalloc
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+from heat import Heat
+from heat import solve_2d
+from heat.stencil import available_backends
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_source_is_added_in_stencil_pass(backend):
+    temp = np.random.random((6, 7))
+    source = np.random.random((6, 7))
+
+    expected = solve_2d(temp, (1.0, 1.0), alpha=0.2, time_step=0.5)
+    expected[1:-1, 1:-1] += 0.5 * source[1:-1, 1:-1]
+
+    actual = solve_2d(
+        temp, (1.0, 1.0), alpha=0.2, time_step=0.5, source=source, backend=backend
+    )
+    assert_array_almost_equal(actual, expected)
+
+
+def test_source_is_allocated_on_demand():
+    heat = Heat(shape=(4, 5))
+    assert heat._source is None
+
+    assert_array_equal(heat.source, 0.0)
+    assert heat.source is heat._source
+
+
+def test_point_sources_match_dense_source():
+    dense, sparse = Heat(shape=(5, 6)), Heat(shape=(5, 6))
+    sparse.temperature = dense.temperature
+
+    dense.source[2, 3] = 4.0
+    dense.source[1, 1] = -1.0
+    sparse.set_point_sources([15, 7, 0], [4.0, -1.0, 100.0])
+
+    for _ in range(3):
+        dense.advance_in_time()
+        sparse.advance_in_time()
+
+    assert_array_almost_equal(sparse.temperature, dense.temperature)
+
+
+def test_bmi_heat_source_rate():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [5, 5]})))
+
+    assert model.get_var_grid("plate_surface__heat_source_rate") == 0
+    assert model.get_var_units("plate_surface__heat_source_rate") == "K s-1"
+
+    model.set_value("plate_surface__temperature", np.zeros(25))
+    model.set_value_at_indices("plate_surface__heat_source_rate", [12], [2.0])
+    model.update()
+
+    z = model.get_value_ptr("plate_surface__temperature")
+    assert z[2, 2] == pytest.approx(2.0 * model.get_time_step())
+    assert_array_equal(z[0, :], 0.0)
+
+
+def test_bmi_source_metadata_does_not_allocate():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [5, 6]})))
+    name = "plate_surface__heat_source_rate"
+
+    assert model.get_var_type(name) == "float64"
+    assert model.get_var_nbytes(name) == 30 * 8
+    assert model.get_var_itemsize(name) == 8
+    assert model._model._source is None
+
+
+@pytest.mark.parametrize(
+    "backend,low_memory",
+    [(backend, False) for backend in available_backends()] + [("numpy", True)],
+)
+def test_forced_step_does_not_allocate(backend, low_memory):
+    heat = Heat(shape=(1000, 400), backend=backend, low_memory=low_memory)
+    heat.source[...] = 1.0
+    heat.advance_in_time()
+
+    tracemalloc.start()
+    heat.advance_in_time()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < heat.temperature.nbytes // 16
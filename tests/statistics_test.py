@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import yaml
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+
+STATISTICS = (
+    "plate_surface__time_average_of_temperature",
+    "plate_surface__time_min_of_temperature",
+    "plate_surface__time_max_of_temperature",
+    "plate_surface__time_variance_of_temperature",
+)
+
+
+def test_statistics_off_by_default():
+    model = BmiHeat()
+    model.initialize()
+
+    assert model.get_output_var_names() == ("plate_surface__temperature",)
+
+
+def test_statistics_var_names():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"statistics": True})))
+
+    assert model.get_output_var_names() == ("plate_surface__temperature",) + STATISTICS
+    assert model.get_output_item_count() == 5
+    for name in STATISTICS:
+        assert model.get_var_grid(name) == 0
+        assert model.get_var_location(name) == "node"
+        assert model.get_var_type(name) == "float64"
+    assert model.get_var_units("plate_surface__time_variance_of_temperature") == "K2"
+
+
+def test_statistics_match_history():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"shape": [6, 7], "statistics": True})))
+
+    z = model.get_value_ptr("plate_surface__temperature")
+    history = [z.copy()]
+    for _ in range(8):
+        model.update()
+        history.append(z.copy())
+    history = np.array(history)
+
+    assert_array_almost_equal(
+        model.get_value_ptr("plate_surface__time_average_of_temperature"),
+        history.mean(axis=0),
+    )
+    assert_array_almost_equal(
+        model.get_value_ptr("plate_surface__time_variance_of_temperature"),
+        history.var(axis=0),
+    )
+    assert_array_equal(
+        model.get_value_ptr("plate_surface__time_min_of_temperature"),
+        history.min(axis=0),
+    )
+    assert_array_equal(
+        model.get_value_ptr("plate_surface__time_max_of_temperature"),
+        history.max(axis=0),
+    )
+
+
+def test_statistics_are_updated_in_place():
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump({"statistics": True})))
+
+    mean = model.get_value_ptr("plate_surface__time_average_of_temperature")
+    model.update_until(3.0)
+
+    assert mean is model.get_value_ptr("plate_surface__time_average_of_temperature")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+import json
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+from numpy.testing import assert_array_equal
+
+from heat import Heat
+from heat import solve_2d
+from heat.stencil import available_backends
+from heat.stencil import get_backend
+from heat.stencil import select_backend
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_backends_match_ndimage(backend):
+    temp = np.random.random((13, 17))
+
+    expected = solve_2d(temp, (1.0, 2.0), alpha=0.3, time_step=0.5)
+    actual = solve_2d(temp, (1.0, 2.0), alpha=0.3, time_step=0.5, backend=backend)
+
+    assert_array_almost_equal(actual, expected)
+    assert_array_equal(actual[(0, -1), :], temp[(0, -1), :])
+    assert_array_equal(actual[:, (0, -1)], temp[:, (0, -1)])
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("not-a-backend")
+    with pytest.raises(ValueError):
+        Heat(backend="not-a-backend")
+
+
+def test_select_backend_is_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("HEAT_CACHE_DIR", str(tmp_path))
+    temp = np.random.random((8, 9))
+
+    name = select_backend(temp, np.empty_like(temp))
+    assert name in available_backends()
+
+    with open(tmp_path / "stencil-backends.json") as fp:
+        cache = json.load(fp)
+    assert cache == {"8x9:float64": name}
+
+    cache["8x9:float64"] = "numpy"
+    with open(tmp_path / "stencil-backends.json", "w") as fp:
+        json.dump(cache, fp)
+    assert select_backend(temp, np.empty_like(temp)) == "numpy"
+
+
+def test_heat_auto_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("HEAT_CACHE_DIR", str(tmp_path))
+
+    heat = Heat(shape=(6, 7), backend="auto")
+    assert heat.backend in available_backends()
+    heat.advance_in_time()
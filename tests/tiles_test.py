@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import yaml
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+
+
+def _initialize(**kwds):
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump(kwds)))
+    return model
+
+
+def test_first_read_returns_all_tiles():
+    model = _initialize(shape=[10, 7])
+    model.add_tile_consumer("viewer", tile_shape=(4, 4))
+
+    dest = np.empty(70)
+    tiles, packed = model.get_changed_tiles("viewer", dest)
+
+    assert_array_equal(tiles, np.arange(6))
+    assert packed.size == 70
+    assert np.shares_memory(packed, dest)
+
+
+def test_only_changed_tiles_are_returned():
+    model = _initialize(shape=[8, 8])
+    model.add_tile_consumer("viewer", tile_shape=(4, 4), threshold=0.5)
+    dest = np.empty(64)
+    model.get_changed_tiles("viewer", dest)
+
+    model.set_value_at_indices("plate_surface__temperature", [63], [10.0])
+    tiles, packed = model.get_changed_tiles("viewer", dest)
+    assert_array_equal(tiles, [3])
+    assert packed[-1] == 10.0
+
+    tiles, packed = model.get_changed_tiles("viewer", dest)
+    assert tiles.size == 0
+    assert packed.size == 0
+
+
+def test_consumers_are_independent():
+    model = _initialize(shape=[8, 8])
+    model.add_tile_consumer("a", tile_shape=(4, 4))
+    dest = np.empty(64)
+    model.get_changed_tiles("a", dest)
+
+    model.set_value_at_indices("plate_surface__temperature", [0], [10.0])
+    model.add_tile_consumer("b", tile_shape=(4, 4))
+
+    assert_array_equal(model.get_changed_tiles("a", dest)[0], [0])
+    assert_array_equal(model.get_changed_tiles("b", dest)[0], [0, 1, 2, 3])
+
+
+def test_round_trip_through_set_value_tiles():
+    source = _initialize(shape=[9, 11])
+    target = _initialize(shape=[9, 11])
+    source.add_tile_consumer("target", tile_shape=(3, 5), threshold=1e-3)
+
+    dest = np.empty(99)
+    for _ in range(5):
+        source.update()
+        tiles, packed = source.get_changed_tiles("target", dest)
+        target.set_value_tiles(
+            "plate_surface__temperature", tiles, packed, tile_shape=(3, 5)
+        )
+
+    assert np.all(
+        np.abs(
+            source.get_value_ptr("plate_surface__temperature")
+            - target.get_value_ptr("plate_surface__temperature")
+        )
+        <= 1e-3
+    )
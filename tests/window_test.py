@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+from io import StringIO
+
+import numpy as np
+import pytest
+import yaml
+from numpy.testing import assert_array_equal
+
+from heat import BmiHeat
+
+
+def _initialize(**kwds):
+    model = BmiHeat()
+    model.initialize(StringIO(yaml.dump(kwds)))
+    return model
+
+
+def test_get_value_window():
+    model = _initialize(shape=[6, 8])
+    z = model.get_value_ptr("plate_surface__temperature")
+
+    dest = np.empty(6)
+    values = model.get_value_window("plate_surface__temperature", dest, (2, 4), (1, 4))
+
+    assert values is dest
+    assert_array_equal(dest, z[2:4, 1:4].flat)
+
+
+def test_get_value_window_into_strided_dest():
+    model = _initialize(shape=[8, 8])
+    z = model.get_value_ptr("plate_surface__temperature")
+
+    dest = np.zeros((6, 4))[:, :3]
+    values = model.get_value_window("plate_surface__temperature", dest, (1, 7), (2, 5))
+    assert values is dest
+    assert_array_equal(dest, z[1:7, 2:5])
+
+    flat = np.zeros(12)[::2]
+    model.get_value_window("plate_surface__temperature", flat, (0, 2), (0, 3))
+    assert_array_equal(flat, z[0:2, 0:3].flat)
+
+    with pytest.raises(ValueError):
+        model.get_value_window("plate_surface__temperature", dest, (0, 3), (0, 6))
+
+
+def test_set_value_window():
+    model = _initialize(shape=[6, 8], coarsening_factors=[2])
+    model.set_value("plate_surface__temperature", np.zeros(48))
+
+    model.set_value_window(
+        "plate_surface__temperature", np.arange(4.0), rows=(0, 2), cols=(6, 8)
+    )
+
+    z = model.get_value_ptr("plate_surface__temperature")
+    assert_array_equal(z[0:2, 6:8], [[0.0, 1.0], [2.0, 3.0]])
+    assert z.sum() == 6.0
+    level = model.get_value_ptr("plate_surface__block_average_of_temperature_2x2")
+    assert level[0, 3] == 1.5
+
+
+@pytest.mark.parametrize(
+    "rows,cols", [((0, 7), (0, 1)), ((2, 2), (0, 1)), ((-1, 2), (0, 1))]
+)
+def test_window_out_of_bounds(rows, cols):
+    model = _initialize(shape=[6, 8])
+
+    with pytest.raises(ValueError):
+        model.get_value_window("plate_surface__temperature", np.empty(8), rows, cols)